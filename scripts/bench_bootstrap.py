@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+import argparse
+import importlib.util
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+def load_bootstrap_module():
+    path = Path(__file__).resolve().parents[1] / "skills" / "project-bootstrap" / "scripts" / "bootstrap.py"
+    spec = importlib.util.spec_from_file_location("bootstrap", path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to import bootstrap module from {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(x) for x in value.split(",") if x.strip()]
+
+
+def build_tree(root: Path, dirs: int, files_per_dir: int) -> None:
+    fanout = max(1, int(dirs**0.5))
+    for i in range(dirs):
+        d = root / f"pkg{i // fanout}" / f"mod{i % fanout}"
+        d.mkdir(parents=True, exist_ok=True)
+        for j in range(files_per_dir):
+            (d / f"f{j}.txt").write_bytes(b"")
+        if i % 50 == 0:
+            (d / "openapi.yaml").write_text("openapi: 3.0.0\n", encoding="utf-8")
+
+
+def with_latency(fn: Callable[..., Any], latency_s: float) -> Callable[..., Any]:
+    def wrapped(*args: Any, **kwargs: Any) -> Any:
+        time.sleep(latency_s)
+        return fn(*args, **kwargs)
+
+    return wrapped
+
+
+def bench_scan(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    module = load_bootstrap_module()
+    if args.latency_ms:
+        # Simulate per-syscall latency of a network filesystem; sleeping releases the GIL like real I/O.
+        latency_s = args.latency_ms / 1000.0
+        module.scan_dir = with_latency(module.scan_dir, latency_s)
+        module.cached_dir_scan = with_latency(module.cached_dir_scan, latency_s)
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        build_tree(root, args.dirs, args.files_per_dir)
+        baseline = None
+        for workers in args.workers:
+            best = None
+            detected = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                detected = module.detect_project(root, scan_workers=workers)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            assert detected is not None and best is not None
+            if baseline is None:
+                baseline = best
+            results.append(
+                {
+                    "workers": workers,
+                    "seconds": round(best, 4),
+                    "speedup": round(baseline / best, 2) if best else None,
+                    "dirs_scanned": detected.scan.dirs_scanned,
+                    "openapi_files": len(detected.openapi_files),
+                }
+            )
+    return results
+
+
+API_TEMPLATE = "---\nname: api-{{API_NAME}}\ndescription: bench\n---\n\n# API: {{API_NAME}}\n"
+
+
+def bench_overlays(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    module = load_bootstrap_module()
+    results: List[Dict[str, Any]] = []
+    for count in args.apis:
+        best = None
+        dirs_scanned = 0
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                root = Path(tmpdir)
+                registry = root / "registry"
+                (registry / "templates").mkdir(parents=True)
+                (registry / "templates" / "api-skeleton.SKILL.template.md").write_text(API_TEMPLATE, encoding="utf-8")
+                project = root / "project"
+                (project / ".codex" / "skills").mkdir(parents=True)
+                detected = module.Detected(
+                    languages=[],
+                    has_docker=False,
+                    has_github_actions=False,
+                    apis=[f"svc{i}" for i in range(count)],
+                    openapi_files=[],
+                )
+
+                scans = [0]
+                index_cls = module.OverlayIndex
+
+                def counting_index(path: Path) -> Any:
+                    scans[0] += 1
+                    return index_cls(path)
+
+                module.OverlayIndex = counting_index
+                try:
+                    start = time.perf_counter()
+                    with module.RegistryReader(registry) as reader:
+                        module.generate_api_skeletons(
+                            registry=reader,
+                            project_root=project,
+                            targets=["codex"],
+                            detected=detected,
+                            todo=[],
+                            prev_generated_hashes={},
+                            new_generated_hashes={},
+                            force_overwrite=False,
+                            adopt_existing=False,
+                            project_prefix="bench",
+                            force_create_overlays=False,
+                            prefix_changed=False,
+                            prev_prefix=None,
+                            overlays_skipped=[],
+                        )
+                    elapsed = time.perf_counter() - start
+                finally:
+                    module.OverlayIndex = index_cls
+                dirs_scanned = scans[0]
+            best = elapsed if best is None else min(best, elapsed)
+        assert best is not None
+        results.append(
+            {
+                "apis": count,
+                "seconds": round(best, 4),
+                "us_per_overlay": round(best / count * 1e6, 1) if count else None,
+                "skills_dir_scans": dirs_scanned,
+            }
+        )
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for project-bootstrap.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    scan = sub.add_parser("scan", help="detect_project tree walk vs --scan-workers")
+    scan.add_argument("--dirs", type=int, default=2000, help="number of leaf directories")
+    scan.add_argument("--files-per-dir", type=int, default=20, help="plain files per leaf directory")
+    scan.add_argument("--workers", type=parse_int_list, default=[1, 2, 4, 8, 16], help="comma-separated list")
+    scan.add_argument("--latency-ms", type=float, default=1.0, help="simulated latency per directory read")
+    scan.add_argument("--repeat", type=int, default=3, help="runs per setting; best time is reported")
+
+    overlays = sub.add_parser("overlays", help="generate_api_skeletons vs number of detected APIs")
+    overlays.add_argument(
+        "--apis", type=parse_int_list, default=[100, 500, 1000, 2000, 4000], help="comma-separated list"
+    )
+    overlays.add_argument("--repeat", type=int, default=3, help="runs per setting; best time is reported")
+
+    args = parser.parse_args()
+    if args.cmd == "scan":
+        results = bench_scan(args)
+    elif args.cmd == "overlays":
+        results = bench_overlays(args)
+    else:
+        parser.error(f"unknown benchmark: {args.cmd}")
+        return 2
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
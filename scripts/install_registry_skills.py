@@ -5,14 +5,23 @@ import os
 import shutil
 import subprocess
 import sys
-from dataclasses import dataclass
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 DEFAULT_REPO = "t3chn/skillregistry"
 DEFAULT_REF = "main"
 DEFAULT_METHOD = "auto"
+DEFAULT_JOBS = 1
+DEFAULT_ARCHIVE_URL = "https://codeload.github.com"
+ARCHIVE_URL_ENV = "SKILLREGISTRY_ARCHIVE_URL"
 
 
 @dataclass
@@ -62,122 +71,275 @@ def build_items(skills: List[str], paths: List[str]) -> List[InstallItem]:
     return items
 
 
-def format_summary(installed: List[str], skipped: List[Dict[str, str]], failed: List[Dict[str, str]]) -> str:
+@dataclass
+class InstallResult:
+    installed: List[str] = field(default_factory=list)
+    skipped: List[Dict[str, str]] = field(default_factory=list)
+    failed: List[Dict[str, str]] = field(default_factory=list)
+    durations: Dict[str, float] = field(default_factory=dict)
+
+
+def format_summary(
+    installed: List[str],
+    skipped: List[Dict[str, str]],
+    failed: List[Dict[str, str]],
+    durations: Optional[Dict[str, float]] = None,
+) -> str:
     summary = {
         "installed": installed,
         "skipped": skipped,
         "failed": failed,
+        "durations": durations or {},
     }
     return json.dumps(summary, indent=2, ensure_ascii=True)
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Install registry skills via system skill-installer.")
-    parser.add_argument("--repo", default=DEFAULT_REPO, help="GitHub repo in owner/repo format")
-    parser.add_argument("--url", default="", help="GitHub URL (overrides --repo if set)")
-    parser.add_argument("--ref", default=DEFAULT_REF, help="Git ref (branch/tag/commit)")
-    parser.add_argument("--dest", required=True, help="Destination skills directory")
-    parser.add_argument("--path", nargs="*", default=[], help="Path(s) to skills inside repo")
-    parser.add_argument("--skill", nargs="*", default=[], help="Skill name(s) under skills/")
-    parser.add_argument(
-        "--method",
-        choices=["auto", "download", "git"],
-        default=DEFAULT_METHOD,
-        help="Install method for skill-installer",
-    )
-    parser.add_argument(
-        "--force-overwrite",
-        "--force-overwrite-registry-skills",
-        action="store_true",
-        help="Overwrite existing skill directories",
+def run_installer(cmd: List[str]) -> Tuple[Optional[str], float]:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
     )
-    parser.add_argument("--json", action="store_true", help="Emit JSON summary to stdout")
+    seconds = round(time.perf_counter() - started, 3)
+    if proc.returncode != 0:
+        return proc.stderr.strip() or proc.stdout.strip() or "install failed", seconds
+    return None, seconds
 
-    args = parser.parse_args()
 
-    installer = skill_installer_script()
-    if not installer.exists():
-        print(
-            f"Error: skill-installer not found at {installer}. Install it or set CODEX_HOME.",
-            file=sys.stderr,
-        )
-        return 1
+def archive_url(base_url: str, repo: str, ref: str) -> str:
+    return f"{base_url.rstrip('/')}/{repo}/zip/{ref}"
 
-    items = build_items(args.skill, args.path)
-    if not items:
-        print("Error: provide at least one --skill or --path", file=sys.stderr)
-        return 1
 
-    dest_root = Path(args.dest)
-    installed: List[str] = []
-    skipped: List[Dict[str, str]] = []
-    failed: List[Dict[str, str]] = []
+def fetch_archive(url: str, workdir: Path, paths: List[str]) -> Path:
+    headers = {"User-Agent": "skillregistry-install"}
+    token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+    if token:
+        headers["Authorization"] = f"token {token}"
+    zip_path = workdir / "archive.zip"
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as resp:
+            with zip_path.open("wb") as out:
+                shutil.copyfileobj(resp, out)
+    except (urllib.error.URLError, OSError) as exc:
+        raise RuntimeError(f"failed to download {url}: {exc}") from exc
+
+    extract_root = workdir / "repo"
+    prefixes = tuple(path.strip("/") + "/" for path in paths)
+    top = ""
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            for info in archive.infolist():
+                head, _, rel = info.filename.partition("/")
+                top = top or head
+                if head != top or not rel.startswith(prefixes) or info.is_dir():
+                    continue
+                parts = Path(rel).parts
+                if ".." in parts or Path(rel).is_absolute():
+                    raise RuntimeError(f"unsafe path in archive: {info.filename}")
+                target = extract_root / rel
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with archive.open(info) as src, target.open("wb") as out:
+                    shutil.copyfileobj(src, out)
+                # Zip entries carry the unix mode in the high bits of external_attr; keep exec bits for scripts.
+                if (info.external_attr >> 16) & 0o111:
+                    target.chmod(0o755)
+    except zipfile.BadZipFile as exc:
+        raise RuntimeError(f"invalid archive from {url}: {exc}") from exc
+    return extract_root
+
+
+def install_from_archive(
+    items: List[InstallItem],
+    dest: Path,
+    url: str,
+) -> List[Tuple[Optional[str], float]]:
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="skillregistry-archive-") as tmpdir:
+        try:
+            root = fetch_archive(url, Path(tmpdir), [item.path for item in items])
+        except RuntimeError as exc:
+            seconds = round(time.perf_counter() - started, 3)
+            return [(str(exc), seconds) for _ in items]
+        fetch_seconds = time.perf_counter() - started
+
+        runs: List[Tuple[Optional[str], float]] = []
+        for item in items:
+            copy_started = time.perf_counter()
+            src = root / item.path
+            reason: Optional[str] = None
+            if not (src / "SKILL.md").is_file():
+                reason = f"not found in archive: {item.path}"
+            else:
+                try:
+                    dest.mkdir(parents=True, exist_ok=True)
+                    shutil.copytree(src, dest / item.name)
+                except OSError as exc:
+                    reason = f"failed to copy {item.path}: {exc}"
+            # The shared download is split evenly so per-skill durations still add up to the wall time.
+            seconds = fetch_seconds / len(items) + time.perf_counter() - copy_started
+            runs.append((reason, round(seconds, 3)))
+        return runs
 
-    repo_flag = "--url" if args.url else "--repo"
-    repo_value = args.url or args.repo
+
+def install(
+    items: List[InstallItem],
+    dest: Path,
+    repo: str = DEFAULT_REPO,
+    url: str = "",
+    ref: str = DEFAULT_REF,
+    method: str = DEFAULT_METHOD,
+    force_overwrite: bool = False,
+    jobs: int = DEFAULT_JOBS,
+    archive_base_url: str = "",
+) -> InstallResult:
+    repo_flag = "--url" if url else "--repo"
+    repo_value = url or repo
     if not repo_value:
-        print("Error: missing --repo or --url", file=sys.stderr)
-        return 1
+        raise RuntimeError("missing --repo or --url")
 
+    use_archive = method == "download" and not url
+    installer = skill_installer_script()
+    if not use_archive and not installer.exists():
+        raise RuntimeError(f"skill-installer not found at {installer}. Install it or set CODEX_HOME.")
+
+    # Outcomes are kept per item so the summary order does not depend on which install finishes first.
+    outcomes: List[Tuple[str, InstallItem, str]] = []
+    commands: Dict[int, List[str]] = {}
     seen = set()
     for item in items:
         if item.name in seen:
-            skipped.append({"name": item.name, "reason": "duplicate entry"})
+            outcomes.append(("skipped", item, "duplicate entry"))
             continue
         seen.add(item.name)
 
         if os.path.isabs(item.path) or os.path.normpath(item.path).startswith(".."):
-            failed.append({"name": item.name, "reason": f"invalid path: {item.path}"})
+            outcomes.append(("failed", item, f"invalid path: {item.path}"))
             continue
 
-        dest_dir = dest_root / item.name
+        dest_dir = dest / item.name
         if dest_dir.exists():
-            if not args.force_overwrite:
-                skipped.append({"name": item.name, "reason": "destination exists"})
+            if not force_overwrite:
+                outcomes.append(("skipped", item, "destination exists"))
                 continue
             try:
                 remove_path(dest_dir)
             except OSError as exc:
-                failed.append({"name": item.name, "reason": f"failed to remove destination: {exc}"})
+                outcomes.append(("failed", item, f"failed to remove destination: {exc}"))
                 continue
 
-        cmd = [
+        commands[len(outcomes)] = [
             sys.executable,
             str(installer),
             repo_flag,
             repo_value,
             "--ref",
-            args.ref,
+            ref,
             "--path",
             item.path,
             "--dest",
-            str(dest_root),
+            str(dest),
             "--method",
-            args.method,
+            method,
         ]
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        outcomes.append(("installed", item, ""))
+
+    # Each skill has its own destination directory, so installs never touch each other's files.
+    slots = list(commands)
+    if use_archive:
+        base_url = archive_base_url or os.environ.get(ARCHIVE_URL_ENV) or DEFAULT_ARCHIVE_URL
+        pending = [outcomes[i][1] for i in slots]
+        runs = install_from_archive(pending, dest, archive_url(base_url, repo, ref)) if pending else []
+    elif jobs > 1 and len(slots) > 1:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(slots))) as pool:
+            runs = list(pool.map(run_installer, [commands[i] for i in slots]))
+    else:
+        runs = [run_installer(commands[i]) for i in slots]
+    for i, (reason, seconds) in zip(slots, runs):
+        item = outcomes[i][1]
+        if reason is not None:
+            outcomes[i] = ("failed", item, reason)
+
+    result = InstallResult()
+    for status, item, reason in outcomes:
+        if status == "installed":
+            result.installed.append(item.name)
+        elif status == "skipped":
+            result.skipped.append({"name": item.name, "reason": reason})
+        else:
+            result.failed.append({"name": item.name, "reason": reason})
+    result.durations = {outcomes[i][1].name: seconds for i, (_, seconds) in zip(slots, runs)}
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Install registry skills via system skill-installer.")
+    parser.add_argument("--repo", default=DEFAULT_REPO, help="GitHub repo in owner/repo format")
+    parser.add_argument("--url", default="", help="GitHub URL (overrides --repo if set)")
+    parser.add_argument("--ref", default=DEFAULT_REF, help="Git ref (branch/tag/commit)")
+    parser.add_argument("--dest", required=True, help="Destination skills directory")
+    parser.add_argument("--path", nargs="*", default=[], help="Path(s) to skills inside repo")
+    parser.add_argument("--skill", nargs="*", default=[], help="Skill name(s) under skills/")
+    parser.add_argument(
+        "--method",
+        choices=["auto", "download", "git"],
+        default=DEFAULT_METHOD,
+        help="Install method for skill-installer",
+    )
+    parser.add_argument(
+        "--force-overwrite",
+        "--force-overwrite-registry-skills",
+        action="store_true",
+        help="Overwrite existing skill directories",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help="Number of skills installed concurrently",
+    )
+    parser.add_argument(
+        "--archive-url",
+        default="",
+        help=f"Base URL serving <repo>/zip/<ref> for --method download (default: ${ARCHIVE_URL_ENV} or codeload)",
+    )
+    parser.add_argument("--json", action="store_true", help="Emit JSON summary to stdout")
+
+    args = parser.parse_args()
+
+    items = build_items(args.skill, args.path)
+    if not items:
+        print("Error: provide at least one --skill or --path", file=sys.stderr)
+        return 1
+
+    try:
+        result = install(
+            items,
+            Path(args.dest),
+            repo=args.repo,
+            url=args.url,
+            ref=args.ref,
+            method=args.method,
+            force_overwrite=args.force_overwrite,
+            jobs=max(1, args.jobs),
+            archive_base_url=args.archive_url,
         )
-        if result.returncode != 0:
-            reason = result.stderr.strip() or result.stdout.strip() or "install failed"
-            failed.append({"name": item.name, "reason": reason})
-            continue
-        installed.append(item.name)
+    except RuntimeError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
 
     if args.json:
-        print(format_summary(installed, skipped, failed))
+        print(format_summary(result.installed, result.skipped, result.failed, result.durations))
     else:
-        for name in installed:
+        for name in result.installed:
             print(f"Installed {name}")
-        for entry in skipped:
+        for entry in result.skipped:
             print(f"Skipped {entry['name']}: {entry['reason']}")
-        for entry in failed:
+        for entry in result.failed:
             print(f"Failed {entry['name']}: {entry['reason']}", file=sys.stderr)
 
-    return 1 if failed else 0
+    return 1 if result.failed else 0
 
 
 if __name__ == "__main__":
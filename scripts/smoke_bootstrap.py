@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
 import json
+import os
 import subprocess
 import sys
 import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
-def run(cmd: List[str], cwd: Optional[Path] = None) -> str:
+def run(cmd: List[str], cwd: Optional[Path] = None, env: Optional[Dict[str, str]] = None) -> str:
     result = subprocess.run(
         cmd,
         cwd=str(cwd) if cwd else None,
+        env=env,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
@@ -37,8 +39,10 @@ def main() -> int:
 
     commit = run(["git", "rev-parse", "HEAD"], cwd=repo_root)
 
-    with tempfile.TemporaryDirectory() as tmpdir:
+    with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as cache_dir:
         project_root = Path(tmpdir)
+        # Keep mirrors, the skill store and compiled templates out of the real ~/.cache.
+        env = dict(os.environ, SKILLREGISTRY_CACHE_DIR=cache_dir)
         run(
             [
                 sys.executable,
@@ -52,6 +56,7 @@ def main() -> int:
                 "local",
             ],
             cwd=project_root,
+            env=env,
         )
 
         errors: List[str] = []
@@ -108,6 +113,7 @@ def main() -> int:
                 "local",
             ],
             cwd=project_root,
+            env=env,
         )
 
         overlay_pending = (
@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
 import argparse
 import hashlib
+import importlib.util
 import json
 import os
 import re
 import shutil
+import stat
 import subprocess
 import sys
-from dataclasses import dataclass
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking degrades to a no-op
+    fcntl = None  # type: ignore[assignment]
 
 
 # -------------------- helpers --------------------
@@ -17,6 +28,9 @@ from typing import Any, Dict, List, Optional, Tuple
 
 KNOWN_TARGETS = {"codex", "claude"}
 SUPPORTED_TARGETS = {"codex"}
+HASH_CHUNK_SIZE = 1 << 20
+UMASK = os.umask(0)
+os.umask(UMASK)
 DEFAULT_REGISTRY_REPO = "t3chn/skillregistry"
 
 
@@ -54,18 +68,89 @@ def write_text(p: Path, s: str) -> None:
     p.write_text(s, encoding="utf-8")
 
 
+def write_text_atomic(p: Path, s: str) -> None:
+    ensure_dir(p.parent)
+    # A unique temp name: shared files (e.g. in the user cache) may be written by several processes at once.
+    fd, tmp = tempfile.mkstemp(dir=str(p.parent), prefix=f".{p.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(s.encode("utf-8"))
+        os.chmod(tmp, 0o666 & ~UMASK)
+        os.replace(tmp, p)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@dataclass
+class WriteStats:
+    written: int = 0
+    skipped: int = 0
+
+    def count(self, written: bool) -> None:
+        with WRITE_STATS_LOCK:
+            if written:
+                self.written += 1
+            else:
+                self.skipped += 1
+
+
+WRITE_STATS_LOCK = threading.Lock()
+WRITE_STATS = WriteStats()
+
+
+def write_if_changed(p: Path, s: str) -> bool:
+    data = s.encode("utf-8")
+    try:
+        if os.stat(p).st_size == len(data) and p.read_bytes() == data:
+            WRITE_STATS.count(written=False)
+            return False
+    except OSError:
+        pass
+    write_text_atomic(p, s)
+    WRITE_STATS.count(written=True)
+    return True
+
+
 def sha256_bytes(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
 
 
 def sha256_file(p: Path) -> str:
-    return sha256_bytes(p.read_bytes())
+    h = hashlib.sha256()
+    with open(p, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def staging_sibling(p: Path, tag: str = "staging") -> Path:
+    return p.with_name(f".{p.name}.bootstrap-{tag}")
+
+
+def swap_dir(staging: Path, dst: Path, backup: Optional[Path] = None) -> None:
+    # Two renames: `dst` is briefly absent between them, but never holds a partially built tree.
+    backup = backup or staging_sibling(dst, "old")
+    if os.path.lexists(backup):
+        remove_path(backup)
+    if os.path.lexists(dst):
+        ensure_dir(backup.parent)
+        os.rename(dst, backup)
+    ensure_dir(dst.parent)
+    os.rename(staging, dst)
+    if os.path.lexists(backup):
+        remove_path(backup)
 
 
 def copy_dir(src: Path, dst: Path) -> None:
-    if dst.exists():
-        shutil.rmtree(dst)
-    shutil.copytree(src, dst)
+    staging = staging_sibling(dst)
+    if os.path.lexists(staging):
+        remove_path(staging)
+    shutil.copytree(src, staging)
+    swap_dir(staging, dst)
 
 
 def remove_dir_if_exists(p: Path) -> bool:
@@ -80,16 +165,12 @@ def exists_any(root: Path, names: List[str]) -> bool:
 
 
 def remove_path(p: Path) -> None:
-    if p.is_dir():
+    if p.is_dir() and not p.is_symlink():
         shutil.rmtree(p)
     else:
         p.unlink()
 
 
-def registry_installer_helper(skillregistry_root: Path) -> Path:
-    return skillregistry_root / "scripts" / "install_registry_skills.py"
-
-
 def slugify(value: str) -> str:
     slug = re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-")
     return slug or "proj"
@@ -122,6 +203,58 @@ def prefixed_overlay_name(prefix: str, base_name: str) -> str:
 # -------------------- detection --------------------
 
 
+OPENAPI_FILE_NAMES = {
+    "openapi.json",
+    "openapi.yaml",
+    "openapi.yml",
+    "swagger.json",
+    "swagger.yaml",
+    "swagger.yml",
+}
+LANGUAGE_MANIFESTS = {
+    "go.mod": "go",
+    "Cargo.toml": "rust",
+    "pyproject.toml": "python",
+    "requirements.txt": "python",
+    "package.json": "ts",
+}
+DOCKER_FILE_NAMES = ["Dockerfile", "docker-compose.yml", "compose.yaml"]
+ENV_FILE_NAMES = [".env.example", ".env", "env.example"]
+COMMAND_FILE_NAMES = ["Taskfile.yml", "justfile", "Makefile", "pnpm-lock.yaml", "yarn.lock"]
+SIGNAL_FILE_NAMES = set(LANGUAGE_MANIFESTS) | set(DOCKER_FILE_NAMES) | set(ENV_FILE_NAMES) | set(COMMAND_FILE_NAMES)
+PRUNE_DIR_NAMES = {
+    ".git",
+    ".hg",
+    ".svn",
+    "node_modules",
+    "target",
+    "vendor",
+    ".venv",
+    "venv",
+    "__pycache__",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+}
+# Bootstrap state and installed skills (which ship their own manifests) are never project code.
+PRUNE_DIR_PATHS = {".agent", ".codex/skills", ".claude/skills"}
+DETECT_SOURCES = ("auto", "filesystem", "git-index")
+DETECT_CACHE_VERSION = 3
+# Entries whose mtime falls this close to the previous scan are rescanned, since a
+# change made in the same timestamp tick as that scan would otherwise go unnoticed.
+DETECT_CACHE_RACY_NS = 2_000_000_000
+
+
+@dataclass
+class WalkStats:
+    source: str = "filesystem"
+    pruned_dirs: int = 0
+    dirs_scanned: int = 0
+    dirs_cached: int = 0
+
+
 @dataclass
 class Detected:
     languages: List[str]
@@ -129,67 +262,555 @@ class Detected:
     has_github_actions: bool
     apis: List[str]  # e.g. "stripe", "sentry"
     openapi_files: List[str]  # relative paths
+    scan: WalkStats = field(default_factory=WalkStats)
 
 
-def detect_project(root: Path) -> Detected:
-    langs: List[str] = []
-    if (root / "go.mod").exists():
-        langs.append("go")
-    if (root / "Cargo.toml").exists():
-        langs.append("rust")
-    if (root / "pyproject.toml").exists() or (root / "requirements.txt").exists():
-        langs.append("python")
-    if (root / "package.json").exists():
-        langs.append("ts")
-
-    has_docker = exists_any(root, ["Dockerfile", "docker-compose.yml", "compose.yaml"])
-    has_gha = (root / ".github" / "workflows").exists()
-
-    api_candidates = set()
-    env_files = [root / ".env.example", root / ".env", root / "env.example"]
-    for f in env_files:
-        if f.exists():
-            txt = read_text(f)
-            for m in re.finditer(
-                r"^([A-Z0-9_]+)_(API_KEY|TOKEN|BASE_URL|API_URL)\s*=",
-                txt,
-                re.M,
-            ):
-                prefix = m.group(1).lower().replace("__", "_")
-                api_candidates.add(prefix)
+@dataclass
+class IgnoreRule:
+    regex: "re.Pattern[str]"
+    negate: bool
+    dir_only: bool
+    base: str = ""  # dir of the .gitignore the rule comes from; patterns match paths relative to it
 
-    openapi_files: List[str] = []
-    for p in root.rglob("*"):
+
+@dataclass
+class DirScan:
+    mtime_ns: int
+    subdirs: List[str]  # names of directories to descend into
+    openapi: List[str]  # names of OpenAPI/Swagger files
+    signals: List[str]  # names of manifests, Docker, env and task-runner files
+    pruned: int
+    ignore: List[Any] = field(default_factory=list)  # nested .gitignore as [size, mtime_ns, text]
+    rules_key: str = ""  # key of the ignore rules inherited from parent dirs
+
+
+@dataclass
+class Workspace:
+    root: Detected
+    packages: Dict[str, Detected]  # package dir relative to the project root -> detection
+    signals: Dict[str, List[str]]  # "" and package dirs -> signal file names
+
+
+@dataclass
+class DetectCache:
+    dirs: Dict[str, DirScan]
+    env: Dict[str, List[Any]]  # rel path -> [size, mtime_ns, apis]
+    trusted_before_ns: int
+
+
+def gitignore_regex(pattern: str) -> str:
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    out: List[str] = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif c == "\\" and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    prefix = "" if anchored else "(?:.*/)?"
+    return f"^{prefix}{''.join(out)}$"
+
+
+def parse_ignore_lines(lines: List[str], base: str = "") -> List[IgnoreRule]:
+    rules: List[IgnoreRule] = []
+    for raw in lines:
+        line = raw.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        rules.append(IgnoreRule(regex=re.compile(gitignore_regex(line)), negate=negate, dir_only=dir_only, base=base))
+    return rules
+
+
+def ignore_source_text(root: Path) -> str:
+    parts: List[str] = []
+    for p in (root / ".git" / "info" / "exclude", root / ".gitignore"):
         if p.is_file():
-            name = p.name.lower()
-            if name in (
-                "openapi.json",
-                "openapi.yaml",
-                "openapi.yml",
-                "swagger.json",
-                "swagger.yaml",
-                "swagger.yml",
-            ):
-                openapi_files.append(str(p.relative_to(root)))
+            try:
+                parts.append(read_text(p))
+            except (OSError, UnicodeDecodeError):
+                continue
+    return "\n".join(parts)
+
+
+def is_ignored(rules: List[IgnoreRule], rel: str, is_dir: bool) -> bool:
+    ignored = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.regex.match(rel[len(rule.base) + 1 :] if rule.base else rel):
+            ignored = not rule.negate
+    return ignored
+
+
+def is_pruned_dir(rules: List[IgnoreRule], rel: str, name: str) -> bool:
+    if name in PRUNE_DIR_NAMES or rel in PRUNE_DIR_PATHS:
+        return True
+    return is_ignored(rules, rel, True)
 
+
+def join_rel(rel_dir: str, name: str) -> str:
+    return f"{rel_dir}/{name}" if rel_dir else name
+
+
+def read_nested_ignore(root: Path, rel_dir: str) -> List[Any]:
+    # The root .gitignore is part of the cache key; nested ones are cached with the dir they live in.
+    if not rel_dir:
+        return []
+    p = root / rel_dir / ".gitignore"
+    try:
+        st = os.stat(p)
+        return [st.st_size, st.st_mtime_ns, read_text(p)]
+    except (OSError, UnicodeDecodeError):
+        return []
+
+
+def child_ignore_rules(
+    rules: List[IgnoreRule], rules_key: str, rel_dir: str, scan: DirScan
+) -> Tuple[List[IgnoreRule], str]:
+    if not scan.ignore:
+        return rules, rules_key
+    text = str(scan.ignore[2])
+    key = sha256_bytes(json.dumps([rules_key, rel_dir, text], ensure_ascii=False).encode("utf-8"))
+    return rules + parse_ignore_lines(text.splitlines(), base=rel_dir), key
+
+
+def scan_dir(root: Path, rel_dir: str, rules: List[IgnoreRule], rules_key: str = "") -> Optional[DirScan]:
+    path = root / rel_dir if rel_dir else root
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return None
+    scan = DirScan(mtime_ns=mtime_ns, subdirs=[], openapi=[], signals=[], pruned=0, rules_key=rules_key)
+    if any(entry.name == ".gitignore" for entry in entries):
+        scan.ignore = read_nested_ignore(root, rel_dir)
+        rules = child_ignore_rules(rules, rules_key, rel_dir, scan)[0]
+    for entry in entries:
+        rel = join_rel(rel_dir, entry.name)
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if is_pruned_dir(rules, rel, entry.name):
+                    scan.pruned += 1
+                else:
+                    scan.subdirs.append(entry.name)
+                continue
+            if entry.name in SIGNAL_FILE_NAMES:
+                scan.signals.append(entry.name)
+            elif entry.name.lower() in OPENAPI_FILE_NAMES:
+                if entry.is_file() and not is_ignored(rules, rel, False):
+                    scan.openapi.append(entry.name)
+        except OSError:
+            continue
+    scan.subdirs.sort()
+    scan.openapi.sort()
+    scan.signals.sort()
+    return scan
+
+
+def cached_dir_scan(
+    root: Path, rel_dir: str, cache: Optional[DetectCache], rules_key: str = ""
+) -> Optional[DirScan]:
+    if cache is None:
+        return None
+    cached = cache.dirs.get(rel_dir)
+    if cached is None or cached.mtime_ns >= cache.trusted_before_ns or cached.rules_key != rules_key:
+        return None
+    try:
+        mtime_ns = os.stat(root / rel_dir if rel_dir else root).st_mtime_ns
+    except OSError:
+        return None
+    if mtime_ns != cached.mtime_ns:
+        return None
+    if cached.ignore:
+        # Editing a .gitignore in place leaves its dir's mtime alone.
+        current = read_nested_ignore(root, rel_dir)
+        if current[:2] != cached.ignore[:2] or int(cached.ignore[1]) >= cache.trusted_before_ns:
+            return None
+    return cached
+
+
+def walk_tree(
+    root: Path,
+    rules: List[IgnoreRule],
+    stats: WalkStats,
+    cache: Optional[DetectCache] = None,
+) -> Iterator[Tuple[str, DirScan]]:
+    stack = [("", rules, "")]
+    while stack:
+        rel_dir, dir_rules, rules_key = stack.pop()
+        scan = cached_dir_scan(root, rel_dir, cache, rules_key)
+        if scan is not None:
+            stats.dirs_cached += 1
+        else:
+            scan = scan_dir(root, rel_dir, dir_rules, rules_key)
+            if scan is None:
+                continue
+            stats.dirs_scanned += 1
+        stats.pruned_dirs += scan.pruned
+        yield rel_dir, scan
+        child_rules, child_key = child_ignore_rules(dir_rules, rules_key, rel_dir, scan)
+        stack.extend((join_rel(rel_dir, name), child_rules, child_key) for name in reversed(scan.subdirs))
+
+
+def walk_tree_parallel(
+    root: Path,
+    rules: List[IgnoreRule],
+    stats: WalkStats,
+    cache: Optional[DetectCache],
+    workers: int,
+) -> Iterator[Tuple[str, DirScan]]:
+    Visit = Tuple[str, List[IgnoreRule], str, Optional[DirScan], bool]
+
+    def visit(rel_dir: str, dir_rules: List[IgnoreRule], rules_key: str) -> Visit:
+        scan = cached_dir_scan(root, rel_dir, cache, rules_key)
+        if scan is not None:
+            return rel_dir, dir_rules, rules_key, scan, True
+        return rel_dir, dir_rules, rules_key, scan_dir(root, rel_dir, dir_rules, rules_key), False
+
+    import queue
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    done: "queue.Queue[Future[Visit]]" = queue.Queue()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detect-scan") as pool:
+
+        def submit(rel_dir: str, dir_rules: List[IgnoreRule], rules_key: str) -> None:
+            pool.submit(visit, rel_dir, dir_rules, rules_key).add_done_callback(done.put)
+
+        submit("", rules, "")
+        outstanding = 1
+        while outstanding:
+            rel_dir, dir_rules, rules_key, scan, was_cached = done.get().result()
+            outstanding -= 1
+            if scan is None:
+                continue
+            if was_cached:
+                stats.dirs_cached += 1
+            else:
+                stats.dirs_scanned += 1
+            stats.pruned_dirs += scan.pruned
+            child_rules, child_key = child_ignore_rules(dir_rules, rules_key, rel_dir, scan)
+            for name in scan.subdirs:
+                submit(join_rel(rel_dir, name), child_rules, child_key)
+                outstanding += 1
+            yield rel_dir, scan
+
+
+def detect_cache_key(ignore_source: str) -> str:
+    payload = json.dumps(
+        [DETECT_CACHE_VERSION, sorted(PRUNE_DIR_NAMES), sorted(PRUNE_DIR_PATHS), ignore_source],
+        ensure_ascii=False,
+    )
+    return sha256_bytes(payload.encode("utf-8"))
+
+
+def load_detect_cache(path: Path, key: str) -> Optional[DetectCache]:
+    if not path.exists():
+        return None
+    try:
+        raw = json.loads(read_text(path))
+        if raw.get("key") != key:
+            return None
+        dirs = {
+            str(rel): DirScan(
+                mtime_ns=int(e[0]),
+                subdirs=list(e[1]),
+                openapi=list(e[2]),
+                signals=list(e[3]),
+                pruned=int(e[4]),
+                ignore=list(e[5]),
+                rules_key=str(e[6]),
+            )
+            for rel, e in raw["dirs"].items()
+        }
+        env = {str(rel): list(e) for rel, e in raw.get("env", {}).items()}
+        trusted_before_ns = int(raw["scanned_at_ns"]) - DETECT_CACHE_RACY_NS
+    except Exception:
+        return None
+    return DetectCache(dirs=dirs, env=env, trusted_before_ns=trusted_before_ns)
+
+
+def save_detect_cache(path: Path, key: str, cache: DetectCache, scanned_at_ns: int) -> None:
+    payload = {
+        "key": key,
+        "scanned_at_ns": scanned_at_ns,
+        "dirs": {
+            rel: [e.mtime_ns, e.subdirs, e.openapi, e.signals, e.pruned, e.ignore, e.rules_key]
+            for rel, e in cache.dirs.items()
+        },
+        "env": cache.env,
+    }
+    ensure_dir(path.parent)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(payload, separators=(",", ":"), ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def parse_env_api_prefixes(txt: str) -> List[str]:
+    prefixes = set()
+    for m in re.finditer(
+        r"^([A-Z0-9_]+)_(API_KEY|TOKEN|BASE_URL|API_URL)\s*=",
+        txt,
+        re.M,
+    ):
+        prefixes.add(m.group(1).lower().replace("__", "_"))
+    return sorted(prefixes)
+
+
+def env_file_apis(
+    root: Path,
+    rel: str,
+    prev: Optional[DetectCache],
+    env_out: Dict[str, List[Any]],
+) -> List[str]:
+    p = root / rel
+    try:
+        st = p.stat()
+    except OSError:
+        return []
+    cached = prev.env.get(rel) if prev else None
+    if (
+        cached is not None
+        and prev is not None
+        and cached[0] == st.st_size
+        and cached[1] == st.st_mtime_ns
+        and st.st_mtime_ns < prev.trusted_before_ns
+    ):
+        apis = [str(a) for a in cached[2]]
+    else:
+        try:
+            apis = parse_env_api_prefixes(read_text(p))
+        except (OSError, UnicodeDecodeError):
+            return []
+    env_out[rel] = [st.st_size, st.st_mtime_ns, apis]
+    return apis
+
+
+def git_index_paths(root: Path) -> Optional[List[str]]:
+    try:
+        p = subprocess.run(
+            ["git", "ls-files", "-z", "--cached"],
+            cwd=str(root),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+            errors="surrogateescape",
+        )
+    except OSError:
+        return None
+    if p.returncode != 0:
+        return None
+    return [path for path in p.stdout.split("\0") if path]
+
+
+def index_dir_scans(paths: List[str], stats: WalkStats) -> Iterator[Tuple[str, DirScan]]:
+    dirs: Dict[str, DirScan] = {"": DirScan(mtime_ns=0, subdirs=[], openapi=[], signals=[], pruned=0)}
+    pruned = set()
+    for path in paths:
+        parts = path.split("/")
+        rel_dir = ""
+        skip = False
+        for name in parts[:-1]:
+            child = join_rel(rel_dir, name)
+            if name in PRUNE_DIR_NAMES or child in PRUNE_DIR_PATHS:
+                if child not in pruned:
+                    pruned.add(child)
+                    dirs[rel_dir].pruned += 1
+                skip = True
+                break
+            if child not in dirs:
+                dirs[rel_dir].subdirs.append(name)
+                dirs[child] = DirScan(mtime_ns=0, subdirs=[], openapi=[], signals=[], pruned=0)
+            rel_dir = child
+        if skip:
+            continue
+        name = parts[-1]
+        if name in SIGNAL_FILE_NAMES:
+            dirs[rel_dir].signals.append(name)
+        elif name.lower() in OPENAPI_FILE_NAMES:
+            dirs[rel_dir].openapi.append(name)
+    for rel_dir in sorted(dirs):
+        scan = dirs[rel_dir]
+        scan.subdirs.sort()
+        scan.openapi.sort()
+        scan.signals.sort()
+        stats.pruned_dirs += scan.pruned
+        yield rel_dir, scan
+
+
+def nearest_package(rel_dir: str, packages: Dict[str, Any]) -> Optional[str]:
+    while rel_dir:
+        if rel_dir in packages:
+            return rel_dir
+        rel_dir = rel_dir.rsplit("/", 1)[0] if "/" in rel_dir else ""
+    return None
+
+
+def detect_workspace(
+    root: Path,
+    cache_path: Optional[Path] = None,
+    scan_workers: int = 1,
+    source: str = "filesystem",
+    find_packages: bool = True,
+) -> Workspace:
+    if source not in DETECT_SOURCES:
+        raise RuntimeError(f"Unknown detect source: {source}")
+    index_paths = None
+    if source != "filesystem":
+        index_paths = git_index_paths(root)
+        if index_paths is None and source == "git-index":
+            raise RuntimeError(f"--detect-source git-index requires a git work tree at {root}")
+
+    stats = WalkStats(source="git-index" if index_paths is not None else "filesystem")
+    prev = None
+    key = ""
+    scanned_at_ns = time.time_ns()
+    if index_paths is not None:
+        cache_path = None
+        walker = index_dir_scans(index_paths, stats)
+    else:
+        ignore_source = ignore_source_text(root)
+        rules = parse_ignore_lines(ignore_source.splitlines())
+        key = detect_cache_key(ignore_source)
+        prev = load_detect_cache(cache_path, key) if cache_path else None
+        if scan_workers > 1:
+            walker = walk_tree_parallel(root, rules, stats, prev, scan_workers)
+        else:
+            walker = walk_tree(root, rules, stats, prev)
+
+    dirs: Dict[str, DirScan] = {}
+    root_signals: List[str] = []
+    openapi_files: List[str] = []
+    for rel_dir, scan in walker:
+        if cache_path or find_packages:
+            dirs[rel_dir] = scan
+        if not rel_dir:
+            root_signals = scan.signals
+        openapi_files.extend(join_rel(rel_dir, name) for name in scan.openapi)
+
+    if index_paths is not None:
+        has_gha = any(path.startswith(".github/workflows/") for path in index_paths)
+    else:
+        has_gha = (root / ".github" / "workflows").exists()
+
+    env: Dict[str, List[Any]] = {}
+
+    def detected_for(rel_dir: str, signals: List[str], openapi: List[str]) -> Detected:
+        api_candidates = set()
+        for name in ENV_FILE_NAMES:
+            # .env files are usually untracked, so the index source still checks them on disk.
+            if name in signals or index_paths is not None:
+                api_candidates.update(env_file_apis(root, join_rel(rel_dir, name), prev, env))
+        return Detected(
+            languages=sorted({LANGUAGE_MANIFESTS[n] for n in signals if n in LANGUAGE_MANIFESTS}),
+            has_docker=any(n in signals for n in DOCKER_FILE_NAMES),
+            has_github_actions=has_gha,
+            apis=sorted(api_candidates),
+            openapi_files=sorted(openapi),
+        )
+
+    root_detected = detected_for("", root_signals, openapi_files)
+    root_detected.scan = stats
+
+    packages: Dict[str, Detected] = {}
+    signals: Dict[str, List[str]] = {"": root_signals}
+    if find_packages:
+        package_openapi: Dict[str, List[str]] = {
+            rel: [] for rel, scan in dirs.items() if rel and any(n in LANGUAGE_MANIFESTS for n in scan.signals)
+        }
+        for rel_dir, scan in dirs.items():
+            owner = nearest_package(rel_dir, package_openapi) if scan.openapi else None
+            if owner is not None:
+                rel_to_owner = rel_dir[len(owner) + 1 :]
+                package_openapi[owner].extend(join_rel(rel_to_owner, name) for name in scan.openapi)
+        for rel in sorted(package_openapi):
+            signals[rel] = dirs[rel].signals
+            packages[rel] = detected_for(rel, dirs[rel].signals, package_openapi[rel])
+
+    if cache_path and (stats.dirs_scanned or prev is None or env != prev.env):
+        save_detect_cache(cache_path, key, DetectCache(dirs=dirs, env=env, trusted_before_ns=0), scanned_at_ns)
+
+    return Workspace(root=root_detected, packages=packages, signals=signals)
+
+
+def detect_project(
+    root: Path,
+    cache_path: Optional[Path] = None,
+    scan_workers: int = 1,
+    source: str = "filesystem",
+) -> Detected:
+    return detect_workspace(root, cache_path, scan_workers, source, find_packages=False).root
+
+
+def merge_detected(workspace: Workspace) -> Detected:
+    merged = workspace.root
+    languages = set(merged.languages)
+    apis = set(merged.apis)
+    has_docker = merged.has_docker
+    for detected in workspace.packages.values():
+        languages.update(detected.languages)
+        apis.update(detected.apis)
+        has_docker = has_docker or detected.has_docker
     return Detected(
-        languages=sorted(set(langs)),
+        languages=sorted(languages),
         has_docker=has_docker,
-        has_github_actions=has_gha,
-        apis=sorted(api_candidates),
-        openapi_files=openapi_files,
+        has_github_actions=merged.has_github_actions,
+        apis=sorted(apis),
+        openapi_files=merged.openapi_files,
+        scan=merged.scan,
     )
 
 
 # -------------------- command inference (MVP) --------------------
 
 
-def infer_commands(root: Path, detected: Detected) -> Dict[str, str]:
-    if (root / "Taskfile.yml").exists():
+def has_file(root: Path, name: str, present: Optional[Set[str]]) -> bool:
+    if present is not None:
+        return name in present
+    return (root / name).exists()
+
+
+def infer_commands(root: Path, detected: Detected, present: Optional[Set[str]] = None) -> Dict[str, str]:
+    if has_file(root, "Taskfile.yml", present):
         return {"build": "task build", "test": "task test", "lint": "task lint", "run": "task run"}
-    if (root / "justfile").exists():
+    if has_file(root, "justfile", present):
         return {"build": "just build", "test": "just test", "lint": "just lint", "run": "just run"}
-    if (root / "Makefile").exists():
+    if has_file(root, "Makefile", present):
         return {"build": "make build", "test": "make test", "lint": "make lint", "run": "make run"}
 
     cmds: Dict[str, str] = {}
@@ -210,9 +831,9 @@ def infer_commands(root: Path, detected: Detected) -> Dict[str, str]:
         cmds.setdefault("run", "python -m your_module  # TODO: adjust")
     if "ts" in detected.languages:
         pm = "npm"
-        if (root / "pnpm-lock.yaml").exists():
+        if has_file(root, "pnpm-lock.yaml", present):
             pm = "pnpm"
-        elif (root / "yarn.lock").exists():
+        elif has_file(root, "yarn.lock", present):
             pm = "yarn"
         cmds.setdefault("build", f"{pm} run build")
         cmds.setdefault("test", f"{pm} test")
@@ -221,14 +842,24 @@ def infer_commands(root: Path, detected: Detected) -> Dict[str, str]:
     return cmds
 
 
+def infer_package_commands(root: Path, workspace: Workspace) -> Dict[str, Dict[str, str]]:
+    # Lock files usually live at the workspace root and decide the package manager for every package.
+    root_locks = {n for n in workspace.signals.get("", []) if n in ("pnpm-lock.yaml", "yarn.lock")}
+    out: Dict[str, Dict[str, str]] = {}
+    for rel, detected in workspace.packages.items():
+        present = set(workspace.signals.get(rel, [])) | root_locks
+        out[rel] = infer_commands(root / rel, detected, present)
+    return out
+
+
 # -------------------- skill selection --------------------
 
 
-def load_skillsets(skillregistry_root: Path) -> Dict[str, List[str]]:
-    p = skillregistry_root / "catalog" / "skillsets.json"
-    if not p.exists():
+def load_skillsets(registry: "RegistryReader") -> Dict[str, List[str]]:
+    raw = registry.read_text("catalog/skillsets.json")
+    if raw is None:
         return {}
-    return json.loads(read_text(p))
+    return json.loads(raw)
 
 
 def select_registry_skills(detected: Detected, skillsets: Dict[str, List[str]]) -> List[str]:
@@ -260,15 +891,858 @@ def normalize_api_name(api: str) -> str:
 # -------------------- registry clone/update --------------------
 
 
-def ensure_skillregistry(project_root: Path, git_url: str, ref: str) -> Tuple[Path, str]:
+REGISTRY_SPARSE_DIRS = ["catalog", "templates", "scripts", "skills/project-bootstrap"]
+
+
+def clone_registry(source: str, sr: Path, partial: bool, shared: bool = False) -> None:
+    cmd = ["git", "clone", "--no-checkout"]
+    if partial:
+        # History and blobs of unselected skills are never needed; blobs are fetched on checkout.
+        cmd += ["--filter=blob:none", "--depth", "1"]
+    if shared:
+        cmd.append("--shared")
+    run(cmd + [source, str(sr)])
+    run(["git", "sparse-checkout", "set", "--cone", *REGISTRY_SPARSE_DIRS], cwd=sr)
+
+
+def is_sparse_registry(sr: Path) -> bool:
+    try:
+        return run(["git", "config", "--bool", "core.sparseCheckout"], cwd=sr) == "true"
+    except RuntimeError:
+        return False
+
+
+def sparse_checkout_registry(sr: Path, skills: List[str]) -> None:
+    if not is_sparse_registry(sr):
+        return
+    wanted = REGISTRY_SPARSE_DIRS + [f"skills/{name}" for name in skills if f"skills/{name}" not in REGISTRY_SPARSE_DIRS]
+    run(["git", "sparse-checkout", "set", "--cone", *wanted], cwd=sr)
+
+
+def is_shallow(sr: Path) -> bool:
+    return (sr / ".git" / "shallow").exists()
+
+
+def depth_args(sr: Path) -> List[str]:
+    return ["--depth", "1"] if is_shallow(sr) else []
+
+
+def fetch_registry_seed(dest: Path, git_url: str, ref: str) -> Tuple[Path, str]:
+    run(["git", "clone", "--no-checkout", git_url, str(dest)])
+    run(["git", "fetch", "--all", "--tags"], cwd=dest)
+    return dest, resolve_commit(dest, ref)
+
+
+def resolve_commit(sr: Path, ref: str) -> str:
+    for candidate in (ref, f"origin/{ref}"):
+        try:
+            return run(["git", "rev-parse", "--verify", "--quiet", f"{candidate}^{{commit}}"], cwd=sr)
+        except RuntimeError:
+            continue
+    raise RuntimeError(f"Unable to resolve registry ref: {ref}")
+
+
+def is_full_sha(ref: str) -> bool:
+    return re.fullmatch(r"[0-9a-f]{40}|[0-9a-f]{64}", ref) is not None
+
+
+def read_head_commit(sr: Path) -> Optional[str]:
+    head = sr / ".git" / "HEAD"
+    try:
+        value = read_text(head).strip()
+    except OSError:
+        return None
+    return value if is_full_sha(value) else None
+
+
+def has_commit(sr: Path, sha: str) -> bool:
+    try:
+        run(["git", "cat-file", "-e", f"{sha}^{{commit}}"], cwd=sr)
+    except RuntimeError:
+        return False
+    return True
+
+
+def detach_to(sr: Path, target: str, checkout: bool) -> str:
+    commit = run(["git", "rev-parse", "--verify", f"{target}^{{commit}}"], cwd=sr)
+    if checkout:
+        run(["git", "checkout", "--detach", commit], cwd=sr)
+    return commit
+
+
+def ensure_skillregistry(
+    project_root: Path,
+    git_url: str,
+    ref: str,
+    seed: Optional[Tuple[Path, str]] = None,
+    use_mirror: bool = False,
+    prev_commit: Optional[str] = None,
+    checkout: bool = True,
+) -> Tuple[Path, str]:
     sr = project_root / ".agent" / "skillregistry"
     ensure_dir(sr.parent)
+    if use_mirror and seed is None:
+        mirror = update_mirror(git_url)
+        seed = (mirror, resolve_commit(mirror, ref))
+    if seed is not None:
+        # The registry was already fetched once (batch seed or shared mirror); only a local fetch is needed.
+        seed_path, commit = seed
+        if not sr.exists():
+            clone_registry(str(seed_path), sr, partial=False, shared=use_mirror)
+            run(["git", "remote", "set-url", "origin", git_url], cwd=sr)
+        if not has_commit(sr, commit):
+            run(["git", "fetch", "--no-tags", *depth_args(sr), str(seed_path), commit], cwd=sr)
+        detach_to(sr, commit, checkout)
+        if use_mirror:
+            record_mirror_borrower(seed_path, sr, commit)
+        return sr, commit
     if not sr.exists():
-        run(["git", "clone", git_url, str(sr)])
-    run(["git", "fetch", "--all", "--tags"], cwd=sr)
-    run(["git", "checkout", ref], cwd=sr)
-    commit = run(["git", "rev-parse", "HEAD"], cwd=sr)
-    return sr, commit
+        clone_registry(git_url, sr, partial=True)
+        try:
+            target = resolve_commit(sr, ref)
+        except RuntimeError:
+            # A depth-1 clone only has the default branch tip.
+            run(["git", "fetch", "--no-tags", *depth_args(sr), "origin", ref], cwd=sr)
+            target = "FETCH_HEAD"
+        return sr, detach_to(sr, target, checkout)
+
+    if is_full_sha(ref):
+        # Pinned commit: no network when it is already checked out or present locally.
+        if checkout and prev_commit == ref and read_head_commit(sr) == ref:
+            return sr, ref
+        if has_commit(sr, ref):
+            return sr, detach_to(sr, ref, checkout)
+
+    try:
+        run(["git", "fetch", "--no-tags", *depth_args(sr), "origin", ref], cwd=sr)
+        target = "FETCH_HEAD"
+    except RuntimeError:
+        # Abbreviated SHAs and servers refusing to serve a bare SHA need the full fetch.
+        run(["git", "fetch", "--all", "--tags", *depth_args(sr)], cwd=sr)
+        target = resolve_commit(sr, ref)
+    return sr, detach_to(sr, target, checkout)
+
+
+# -------------------- registry reads --------------------
+
+
+REGISTRY_READ_MODES = ("worktree", "objects")
+REGISTRY_INSTALLER_HELPER = "scripts/install_registry_skills.py"
+GIT_SYMLINK_MODE = "120000"
+GIT_EXECUTABLE_MODE = "100755"
+
+
+@dataclass
+class TreeEntry:
+    mode: str
+    oid: str
+    path: str
+    size: int
+
+
+def write_blob(out: Path, mode: str, data: bytes) -> None:
+    ensure_dir(out.parent)
+    if mode == GIT_SYMLINK_MODE:
+        os.symlink(data.decode("utf-8"), out)
+        return
+    out.write_bytes(data)
+    if mode == GIT_EXECUTABLE_MODE:
+        os.chmod(out, 0o755)
+
+
+class RegistryReader:
+    def __init__(self, root: Path, commit: Optional[str] = None, head: Optional[str] = None) -> None:
+        self.root = root
+        self.commit = commit
+        # Only used to key caches.
+        self.revision = commit or head
+        self._batch: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "RegistryReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._batch is not None:
+            assert self._batch.stdin is not None
+            self._batch.stdin.close()
+            self._batch.wait()
+            self._batch = None
+
+    def describe(self, rel: str) -> str:
+        if self.commit is None:
+            return str(self.root / rel)
+        return f"{self.commit[:12]}:{rel}"
+
+    def cat_file(self, spec: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            if self._batch is None:
+                self._batch = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    cwd=str(self.root),
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                )
+            assert self._batch.stdin is not None and self._batch.stdout is not None
+            self._batch.stdin.write(spec.encode("utf-8") + b"\n")
+            self._batch.stdin.flush()
+            header = self._batch.stdout.readline().decode("utf-8")
+            if not header:
+                raise RuntimeError(f"git cat-file --batch exited while reading {spec}")
+            parts = header.split()
+            if len(parts) != 3 or parts[-1] in ("missing", "ambiguous"):
+                return None
+            data = self._batch.stdout.read(int(parts[2]))
+            self._batch.stdout.read(1)
+            return parts[1], data
+
+    def read_bytes(self, rel: str) -> Optional[bytes]:
+        if self.commit is None:
+            p = self.root / rel
+            return p.read_bytes() if p.is_file() else None
+        found = self.cat_file(f"{self.commit}:{rel}")
+        if found is None or found[0] != "blob":
+            return None
+        return found[1]
+
+    def read_text(self, rel: str) -> Optional[str]:
+        data = self.read_bytes(rel)
+        return None if data is None else data.decode("utf-8")
+
+    def exists(self, rel: str) -> bool:
+        if self.commit is None:
+            return (self.root / rel).exists()
+        return self.cat_file(f"{self.commit}:{rel}") is not None
+
+    def export(self, rel: str, dst: Path) -> None:
+        if self.commit is None:
+            src = self.root / rel
+            if src.is_dir():
+                copy_dir(src, dst)
+            else:
+                ensure_dir(dst.parent)
+                shutil.copy2(src, dst)
+            return
+        for entry in self.tree(rel):
+            write_blob(dst / entry.path, entry.mode, self.read_object(entry.oid))
+
+    def tree(self, rel: str) -> List["TreeEntry"]:
+        listing = run(["git", "ls-tree", "-r", "-l", "-z", self.commit or "HEAD", "--", rel], cwd=self.root)
+        entries: List[TreeEntry] = []
+        for item in listing.split("\0"):
+            if not item:
+                continue
+            meta, path = item.split("\t", 1)
+            mode, kind, oid, size = meta.split()
+            if kind == "blob":
+                entries.append(TreeEntry(mode, oid, Path(path).relative_to(rel).as_posix(), int(size)))
+        return entries
+
+    def prefetch(self, rels: List[str]) -> int:
+        # A blob:none clone would fetch every blob read below on its own round trip; backfill them in one fetch.
+        if self.commit is None or not rels:
+            return 0
+        listing = run(["git", "ls-tree", "-r", "-z", self.commit, "--", *rels], cwd=self.root)
+        wanted = {item.split("\t", 1)[0].split()[2] for item in listing.split("\0") if " blob " in item}
+        if not wanted:
+            return 0
+        objects = run(["git", "rev-list", "--objects", "--missing=print", self.commit], cwd=self.root)
+        missing = sorted(line[1:] for line in objects.splitlines() if line.startswith("?") and line[1:] in wanted)
+        if missing:
+            run(
+                ["git", "-c", "fetch.negotiationAlgorithm=noop", "fetch", "--no-tags", "--no-write-fetch-head"]
+                + ["--no-auto-maintenance", "--recurse-submodules=no", "--filter=blob:none", "origin", *missing],
+                cwd=self.root,
+            )
+        return len(missing)
+
+    def read_object(self, oid: str) -> bytes:
+        found = self.cat_file(oid)
+        if found is None:
+            raise RuntimeError(f"Registry object missing: {oid}")
+        return found[1]
+
+    def local_path(self, rel: str, scratch: Path) -> Path:
+        if self.commit is None:
+            return self.root / rel
+        dst = scratch / rel
+        self.export(rel, dst)
+        return dst
+
+
+# -------------------- shared registry mirror --------------------
+
+
+MIRROR_USAGE_FILE = "bootstrap-usage.json"
+MIRROR_KEEP_REFS = "refs/bootstrap/keep/"
+DEFAULT_CACHE_MAX_AGE_DAYS = 30
+
+
+def user_cache_dir() -> Path:
+    override = os.environ.get("SKILLREGISTRY_CACHE_DIR")
+    if override:
+        return Path(override).expanduser()
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "skillregistry"
+
+
+def normalize_git_url(git_url: str) -> str:
+    local = Path(git_url).expanduser()
+    if local.exists():
+        return str(local.resolve())
+    return git_url
+
+
+def mirror_path(git_url: str) -> Path:
+    digest = sha256_bytes(normalize_git_url(git_url).encode("utf-8"))[:16]
+    return user_cache_dir() / f"{digest}.git"
+
+
+@contextmanager
+def locked_file(path: Path, exclusive: bool = True) -> Iterator[None]:
+    if fcntl is None:
+        yield
+        return
+    ensure_dir(path.parent)
+    with open(path, "a+") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def update_mirror(git_url: str) -> Path:
+    mirror = mirror_path(git_url)
+    if not mirror.exists():
+        ensure_dir(mirror.parent)
+        tmp = mirror.with_name(f"{mirror.name}.tmp-{os.getpid()}")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        run(["git", "clone", "--mirror", normalize_git_url(git_url), str(tmp)])
+        try:
+            os.rename(tmp, mirror)
+        except OSError:
+            # Another bootstrap created the mirror first; use theirs.
+            shutil.rmtree(tmp, ignore_errors=True)
+    else:
+        run(["git", "fetch", "--prune", "origin"], cwd=mirror)
+    return mirror
+
+
+def load_mirror_usage(mirror: Path) -> Dict[str, Any]:
+    p = mirror / MIRROR_USAGE_FILE
+    if not p.exists():
+        return {}
+    try:
+        usage = json.loads(read_text(p))
+    except Exception:
+        return {}
+    return usage if isinstance(usage, dict) else {}
+
+
+def save_mirror_usage(mirror: Path, usage: Dict[str, Any]) -> None:
+    p = mirror / MIRROR_USAGE_FILE
+    tmp = p.with_name(p.name + ".tmp")
+    tmp.write_text(json.dumps(usage, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp, p)
+
+
+def record_mirror_borrower(mirror: Path, sr: Path, commit: str) -> None:
+    with locked_file(mirror / "bootstrap-usage.lock"):
+        usage = load_mirror_usage(mirror)
+        now = int(time.time())
+        usage["last_used"] = now
+        borrowers = usage.setdefault("borrowers", {})
+        borrowers[str(sr.resolve())] = {"commit": commit, "last_used": now}
+        save_mirror_usage(mirror, usage)
+
+
+def dir_size(p: Path) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(p):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def borrows_from(sr: Path, mirror: Path) -> bool:
+    alternates = sr / ".git" / "objects" / "info" / "alternates"
+    if not alternates.is_file():
+        return False
+    objects = str((mirror / "objects").resolve())
+    return any(str(Path(line.strip()).resolve()) == objects for line in read_text(alternates).splitlines() if line.strip())
+
+
+def dissociate_borrower(sr: Path) -> None:
+    run(["git", "repack", "-a", "-d", "-q"], cwd=sr)
+    (sr / ".git" / "objects" / "info" / "alternates").unlink()
+
+
+def gc_mirror(mirror: Path, max_age_s: int) -> Dict[str, Any]:
+    with locked_file(mirror / "bootstrap-usage.lock"):
+        usage = load_mirror_usage(mirror)
+        now = int(time.time())
+        size_before = dir_size(mirror)
+        borrowers = {
+            path: info
+            for path, info in (usage.get("borrowers") or {}).items()
+            if borrows_from(Path(path), mirror)
+        }
+        dropped = sorted(set(usage.get("borrowers") or {}) - set(borrowers))
+
+        if now - int(usage.get("last_used") or 0) > max_age_s:
+            for path in sorted(borrowers):
+                dissociate_borrower(Path(path))
+            shutil.rmtree(mirror)
+            return {
+                "path": str(mirror),
+                "action": "removed",
+                "size_before": size_before,
+                "size_after": 0,
+                "dissociated": sorted(borrowers),
+            }
+
+        # Commits checked out by live borrowers must survive gc even if upstream rewrote history.
+        keep = sorted({str(info.get("commit")) for info in borrowers.values() if info.get("commit")})
+        existing = run(["git", "for-each-ref", "--format=%(refname)", MIRROR_KEEP_REFS], cwd=mirror).splitlines()
+        for ref in existing:
+            if ref[len(MIRROR_KEEP_REFS) :] not in keep:
+                run(["git", "update-ref", "-d", ref], cwd=mirror)
+        for commit in keep:
+            run(["git", "update-ref", f"{MIRROR_KEEP_REFS}{commit}", commit], cwd=mirror)
+        try:
+            run(["git", "maintenance", "run", "--task=gc"], cwd=mirror)
+        except RuntimeError:
+            run(["git", "gc", "--quiet"], cwd=mirror)
+
+        usage["borrowers"] = borrowers
+        save_mirror_usage(mirror, usage)
+        return {
+            "path": str(mirror),
+            "action": "gc",
+            "size_before": size_before,
+            "size_after": dir_size(mirror),
+            "kept_commits": keep,
+            "dropped_borrowers": dropped,
+        }
+
+
+def cache_gc(max_age_days: int) -> Dict[str, Any]:
+    cache = user_cache_dir()
+    results: List[Dict[str, Any]] = []
+    if cache.is_dir():
+        for mirror in sorted(cache.glob("*.git")):
+            if mirror.is_dir():
+                results.append(gc_mirror(mirror, max_age_days * 86400))
+    summary: Dict[str, Any] = {"cache_dir": str(cache), "mirrors": results}
+    if store_root().is_dir():
+        summary["store"] = gc_store(store_root(), max_age_days * 86400)
+    summary["templates_removed"] = gc_template_cache(cache / "templates", max_age_days * 86400)
+    return summary
+
+
+def gc_template_cache(root: Path, max_age_s: int) -> int:
+    removed = 0
+    cutoff = time.time() - max_age_s
+    for p in root.glob("*.json") if root.is_dir() else []:
+        try:
+            if p.stat().st_mtime < cutoff:
+                p.unlink()
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+# -------------------- content-addressed skill store --------------------
+
+
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+CLONE_UNSUPPORTED: Set[Tuple[str, int]] = set()
+
+
+def store_root() -> Path:
+    return user_cache_dir() / "store"
+
+
+def store_object(store: Path, registry: RegistryReader, oid: str, executable: bool) -> Path:
+    # Keyed by git object id, so a skill already in the store costs no registry reads at all.
+    # Executables get their own entry because hardlinks share the mode bits.
+    blob = store / "objects" / oid[:2] / (oid[2:] + ("-x" if executable else ""))
+    if blob.exists():
+        return blob
+    ensure_dir(blob.parent)
+    fd, tmp = tempfile.mkstemp(dir=str(blob.parent), prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(registry.read_object(oid))
+    os.chmod(tmp, 0o555 if executable else 0o444)
+    os.replace(tmp, blob)
+    return blob
+
+
+def clone_file(src: Path, dst: Path, mode: int) -> str:
+    dev = os.stat(dst.parent).st_dev
+    if fcntl is not None and sys.platform.startswith("linux") and ("reflink", dev) not in CLONE_UNSUPPORTED:
+        try:
+            with open(src, "rb") as s, open(dst, "wb") as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            os.chmod(dst, mode)
+            return "reflink"
+        except OSError:
+            CLONE_UNSUPPORTED.add(("reflink", dev))
+            if os.path.lexists(dst):
+                dst.unlink()
+    if ("hardlink", dev) not in CLONE_UNSUPPORTED:
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            CLONE_UNSUPPORTED.add(("hardlink", dev))
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        remaining = os.fstat(s.fileno()).st_size
+        try:
+            while remaining > 0 and hasattr(os, "copy_file_range"):
+                copied = os.copy_file_range(s.fileno(), d.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            pass
+        # Finishes from the current offsets when copy_file_range is unavailable or stopped early.
+        shutil.copyfileobj(s, d)
+    os.chmod(dst, mode)
+    return "copy"
+
+
+def install_from_store(
+    registry: RegistryReader,
+    store: Path,
+    entries: List[TreeEntry],
+    dst: Path,
+) -> None:
+    ensure_dir(dst)
+    for entry in entries:
+        out = dst / entry.path
+        if entry.mode == GIT_SYMLINK_MODE:
+            write_blob(out, entry.mode, registry.read_object(entry.oid))
+            continue
+        ensure_dir(out.parent)
+        executable = entry.mode == GIT_EXECUTABLE_MODE
+        blob = store_object(store, registry, entry.oid, executable)
+        clone_file(blob, out, 0o755 if executable else 0o644)
+
+
+def gc_store(store: Path, max_age_s: int) -> Dict[str, Any]:
+    # Objects still hardlinked into a project are always kept; reflinked and copied installs own their bytes.
+    cutoff = time.time() - max_age_s
+    removed = 0
+    freed = 0
+    kept = 0
+    for blob in store.glob("objects/*/*"):
+        st = blob.lstat()
+        if st.st_nlink > 1 or st.st_mtime >= cutoff:
+            kept += 1
+            continue
+        blob.unlink()
+        removed += 1
+        freed += st.st_size
+    return {"path": str(store), "removed": removed, "kept": kept, "bytes_freed": freed}
+
+
+# -------------------- delta sync --------------------
+
+
+SYNC_JUNK_NAMES = {"__pycache__", ".DS_Store", ".pytest_cache", ".mypy_cache"}
+SYNC_JUNK_SUFFIXES = (".pyc", ".pyo")
+
+
+@dataclass
+class SyncStats:
+    written: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+
+
+def is_sync_junk(name: str) -> bool:
+    return name in SYNC_JUNK_NAMES or name.endswith(SYNC_JUNK_SUFFIXES)
+
+
+def list_files(root: Path) -> Dict[str, os.stat_result]:
+    out: Dict[str, os.stat_result] = {}
+    stack = [("", root)]
+    while stack:
+        rel_dir, d = stack.pop()
+        try:
+            it = os.scandir(d)
+        except FileNotFoundError:
+            continue
+        with it:
+            for e in it:
+                if is_sync_junk(e.name):
+                    continue
+                rel = join_rel(rel_dir, e.name)
+                if e.is_dir(follow_symlinks=False):
+                    stack.append((rel, Path(e.path)))
+                else:
+                    out[rel] = e.stat(follow_symlinks=False)
+    return out
+
+
+def git_blob_id(data: bytes, oid: str) -> str:
+    algo = hashlib.sha256 if len(oid) == 64 else hashlib.sha1
+    return algo(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def is_executable(st: os.stat_result) -> bool:
+    return bool(st.st_mode & 0o100)
+
+
+def same_as_worktree(src: Path, src_st: os.stat_result, dst: Path, dst_st: os.stat_result) -> bool:
+    if stat.S_ISLNK(src_st.st_mode) or stat.S_ISLNK(dst_st.st_mode):
+        return stat.S_ISLNK(src_st.st_mode) == stat.S_ISLNK(dst_st.st_mode) and os.readlink(src) == os.readlink(dst)
+    if src_st.st_size != dst_st.st_size or is_executable(src_st) != is_executable(dst_st):
+        return False
+    if src_st.st_mtime_ns == dst_st.st_mtime_ns:
+        return True
+    if sha256_file(src) != sha256_file(dst):
+        return False
+    # Same bytes, different mtime: adopt the source mtime so the next run takes the stat shortcut,
+    # unless dst is hardlinked (e.g. into the shared store), where utime would touch every link.
+    if dst_st.st_nlink == 1:
+        os.utime(dst, ns=(dst_st.st_atime_ns, src_st.st_mtime_ns))
+    return True
+
+
+def same_as_blob(entry: TreeEntry, dst: Path, dst_st: os.stat_result) -> bool:
+    if entry.mode == GIT_SYMLINK_MODE or stat.S_ISLNK(dst_st.st_mode):
+        if entry.mode != GIT_SYMLINK_MODE or not stat.S_ISLNK(dst_st.st_mode):
+            return False
+        return git_blob_id(os.readlink(dst).encode("utf-8"), entry.oid) == entry.oid
+    if entry.size != dst_st.st_size or (entry.mode == GIT_EXECUTABLE_MODE) != is_executable(dst_st):
+        return False
+    return git_blob_id(dst.read_bytes(), entry.oid) == entry.oid
+
+
+def swap_file(tmp: Path, out: Path) -> None:
+    # rename() only replaces the directory entry, so an inode hardlinked into the shared store is never written
+    # through, and readers see either the old or the new file.
+    if out.is_dir() and not out.is_symlink():
+        shutil.rmtree(out)
+    os.replace(tmp, out)
+
+
+def prune_empty_dirs(root: Path) -> None:
+    for d, subdirs, files in os.walk(root, topdown=False):
+        if d != str(root) and not subdirs and not files:
+            try:
+                os.rmdir(d)
+            except OSError:
+                pass
+
+
+def sync_tree(registry: RegistryReader, rel: str, dst: Path) -> SyncStats:
+    stats = SyncStats()
+    existing = list_files(dst)
+    if registry.commit is None:
+        src_root = registry.root / rel
+        wanted: Dict[str, Any] = list_files(src_root)
+    else:
+        wanted = {e.path: e for e in registry.tree(rel) if not any(is_sync_junk(p) for p in e.path.split("/"))}
+
+    for path in sorted(set(existing) - set(wanted)):
+        (dst / path).unlink()
+        stats.deleted += 1
+    if stats.deleted:
+        prune_empty_dirs(dst)
+
+    ensure_dir(dst)
+    for path, src in wanted.items():
+        out = dst / path
+        cur = existing.get(path)
+        if registry.commit is None:
+            if cur is not None and same_as_worktree(src_root / path, src, out, cur):
+                stats.unchanged += 1
+                continue
+            tmp = staging_sibling(out, "tmp")
+            ensure_dir(out.parent)
+            if os.path.lexists(tmp):
+                tmp.unlink()
+            if stat.S_ISLNK(src.st_mode):
+                os.symlink(os.readlink(src_root / path), tmp)
+            else:
+                shutil.copy2(src_root / path, tmp)
+        else:
+            if cur is not None and same_as_blob(src, out, cur):
+                stats.unchanged += 1
+                continue
+            tmp = staging_sibling(out, "tmp")
+            if os.path.lexists(tmp):
+                tmp.unlink()
+            write_blob(tmp, src.mode, registry.read_object(src.oid))
+        swap_file(tmp, out)
+        stats.written += 1
+    return stats
+
+
+# -------------------- install transactions --------------------
+
+TXN_DIR = "txn"
+
+
+def txn_dir(project_root: Path) -> Path:
+    return project_root / ".agent" / TXN_DIR
+
+
+def txn_journal(project_root: Path) -> Path:
+    return txn_dir(project_root) / "journal.json"
+
+
+def txn_path(project_root: Path, rel: str, tag: str = "staging", legacy: bool = False) -> Path:
+    # Staged trees live under .agent/txn (same filesystem, so swaps are renames) where agents never look;
+    # journals written before that layout used dot-siblings inside the skills dir.
+    if legacy:
+        return staging_sibling(project_root / rel, tag)
+    return txn_dir(project_root) / tag / rel
+
+
+def finish_txn(project_root: Path, state: str, swaps: List[str], legacy: bool = False) -> None:
+    # Roll forward only once the journal says "commit"; safe to repeat after a crash.
+    for rel in swaps:
+        dst = project_root / rel
+        staging = txn_path(project_root, rel, legacy=legacy)
+        backup = txn_path(project_root, rel, "old", legacy=legacy)
+        if state == "commit" and os.path.lexists(staging):
+            swap_dir(staging, dst, backup)
+        elif os.path.lexists(staging):
+            remove_path(staging)
+        if os.path.lexists(backup):
+            if state != "commit" and not os.path.lexists(dst):
+                os.rename(backup, dst)
+            else:
+                remove_path(backup)
+    if os.path.lexists(txn_dir(project_root)):
+        remove_path(txn_dir(project_root))
+
+
+def recover_txn(project_root: Path) -> Optional[str]:
+    legacy = txn_dir(project_root).is_file()
+    journal = txn_dir(project_root) if legacy else txn_journal(project_root)
+    if not journal.exists():
+        if os.path.lexists(txn_dir(project_root)):
+            remove_path(txn_dir(project_root))
+        return None
+    try:
+        data = json.loads(read_text(journal))
+    except (OSError, ValueError):
+        data = {}
+    state = str(data.get("state") or "")
+    finish_txn(project_root, state, [str(rel) for rel in data.get("swaps") or []], legacy=legacy)
+    return "forward" if state == "commit" else "back"
+
+
+# The journal is written before any staging dir exists: recover_txn rolls back a "prepare" run, forward a "commit" one.
+class InstallTxn:
+    def __init__(self, project_root: Path) -> None:
+        self.project_root = project_root
+        self.swaps: List[str] = []
+
+    def __enter__(self) -> "InstallTxn":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if not self.swaps:
+            return
+        if exc_type is None:
+            self.write_journal("commit")
+            finish_txn(self.project_root, "commit", self.swaps)
+        else:
+            finish_txn(self.project_root, "prepare", self.swaps)
+
+    def write_journal(self, state: str) -> None:
+        payload = {"state": state, "swaps": self.swaps}
+        write_text_atomic(txn_journal(self.project_root), json.dumps(payload, indent=2) + "\n")
+
+    def stage(self, dst: Path) -> Path:
+        rel = dst.relative_to(self.project_root).as_posix()
+        if rel not in self.swaps:
+            self.swaps.append(rel)
+            self.write_journal("prepare")
+        staging = txn_path(self.project_root, rel)
+        if os.path.lexists(staging):
+            remove_path(staging)
+        ensure_dir(staging.parent)
+        return staging
+
+
+# -------------------- project lock --------------------
+
+PROJECT_LOCK = "bootstrap.lock"
+INIT_KEY_IGNORED_ARGS = ("cmd", "roots", "roots_file", "jobs")
+
+
+# init holds it exclusively and records its run on release, so a writer that waited can reuse it.
+class ProjectLock:
+    def __init__(self, root: Path, exclusive: bool) -> None:
+        self.path = root / ".agent" / PROJECT_LOCK
+        self.exclusive = exclusive
+        self.waited = False
+        self.wait_started_ns = 0
+        self.acquired_ns = 0
+        self._fh: Any = None
+
+    def __enter__(self) -> "ProjectLock":
+        ensure_dir(self.path.parent)
+        self._fh = open(self.path, "a+", encoding="utf-8")
+        if fcntl is None:
+            return self
+        op = fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH
+        try:
+            fcntl.flock(self._fh.fileno(), op | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.waited = True
+            self.wait_started_ns = time.time_ns()
+            fcntl.flock(self._fh.fileno(), op)
+        self.acquired_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+        self._fh.close()
+
+    def last_run(self) -> Dict[str, Any]:
+        self._fh.seek(0)
+        try:
+            data = json.loads(self._fh.read() or "{}")
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def record_run(self, key: str) -> None:
+        self._fh.seek(0)
+        self._fh.truncate()
+        record = {"key": key, "started_ns": self.acquired_ns, "finished_ns": time.time_ns(), "pid": os.getpid()}
+        self._fh.write(json.dumps(record) + "\n")
+        self._fh.flush()
+
+    def started_while_waiting(self, key: str) -> bool:
+        # Only a run that began after this one was invoked has seen the tree and registry this one would see.
+        last = self.last_run()
+        return self.waited and last.get("key") == key and int(last.get("started_ns") or 0) >= self.wait_started_ns
+
+
+def init_request_key(root: Path, args: argparse.Namespace) -> str:
+    inputs = {k: v for k, v in vars(args).items() if k not in INIT_KEY_IGNORED_ARGS}
+    inputs["root"] = str(root.resolve())
+    return sha256_bytes(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8"))
 
 
 # -------------------- state --------------------
@@ -283,9 +1757,83 @@ def load_prev_state(state_path: Path) -> Dict[str, Any]:
         return {}
 
 
+# -------------------- phase fingerprints --------------------
+
+
+@dataclass
+class PhaseLog:
+    prev: Dict[str, Any]
+    records: Dict[str, Any] = field(default_factory=dict)
+    ran: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+
+    def reuse(
+        self,
+        root: Path,
+        name: str,
+        inputs: Dict[str, Any],
+        valid: Optional[Callable[[], bool]] = None,
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        fingerprint = phase_fingerprint(inputs)
+        prev = self.prev.get(name)
+        if (
+            isinstance(prev, dict)
+            and prev.get("fingerprint") == fingerprint
+            and outputs_unchanged(root, prev.get("outputs") or {})
+            and (valid is None or valid())
+        ):
+            self.records[name] = prev
+            self.skipped.append(name)
+            return fingerprint, prev
+        self.ran.append(name)
+        return fingerprint, None
+
+    def record(
+        self,
+        name: str,
+        fingerprint: str,
+        outputs: Dict[str, Optional[List[int]]],
+        todo: List[str],
+        result: Dict[str, Any],
+    ) -> None:
+        self.records[name] = {"fingerprint": fingerprint, "outputs": outputs, "todo": todo, "result": result}
+
+
+def phase_fingerprint(inputs: Dict[str, Any]) -> str:
+    return sha256_bytes(json.dumps(inputs, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+
+
+def stat_outputs(root: Path, paths: List[Path]) -> Dict[str, Optional[List[int]]]:
+    out: Dict[str, Optional[List[int]]] = {}
+    for p in paths:
+        try:
+            out[p.relative_to(root).as_posix()] = stat_key(os.lstat(p))
+        except FileNotFoundError:
+            out[p.relative_to(root).as_posix()] = None
+    return out
+
+
+def outputs_unchanged(root: Path, outputs: Dict[str, Any]) -> bool:
+    return stat_outputs(root, [root / rel for rel in outputs]) == outputs
+
+
+def skill_dir_listing(project_root: Path, targets: List[str], generated: Set[str]) -> Dict[str, List[str]]:
+    # Overlay similarity checks depend on the other skills present; bootstrap's own overlays are excluded.
+    listing: Dict[str, List[str]] = {}
+    for t in targets:
+        root = skills_root(project_root, t)
+        names = [e.name for e in os.scandir(root) if e.is_dir() and e.name not in generated] if root.is_dir() else []
+        listing[t] = sorted(names)
+    return listing
+
+
 # -------------------- installation & cleanup --------------------
 
 
+INSTALL_METHODS = ("skill-installer", "local", "store")
+REGISTRY_INSTALL_JOBS = 8
+
+
 def skill_dst(project_root: Path, target: str, name: str) -> Path:
     if target == "codex":
         return project_root / ".codex" / "skills" / name
@@ -340,7 +1888,7 @@ def format_registry_installer_failures(failed: List[Dict[str, str]]) -> str:
 
 
 def install_registry_skills(
-    skillregistry_root: Path,
+    registry: RegistryReader,
     project_root: Path,
     skills: List[str],
     targets: List[str],
@@ -349,7 +1897,7 @@ def install_registry_skills(
     force_overwrite: bool,
     registry_ref: str,
 ) -> Tuple[List[str], List[Dict[str, str]]]:
-    if install_method not in ("skill-installer", "local"):
+    if install_method not in INSTALL_METHODS:
         raise RuntimeError(f"Unknown install method: {install_method}")
 
     installed: List[str] = []
@@ -357,9 +1905,9 @@ def install_registry_skills(
     seen_installed = set()
     available_skills: List[str] = []
     for name in skills:
-        src = skillregistry_root / "skills" / name
-        if not src.exists():
-            todo.append(f"- Missing skill in registry: `{name}` (expected {src})")
+        src = f"skills/{name}"
+        if not registry.exists(src):
+            todo.append(f"- Missing skill in registry: `{name}` (expected {registry.describe(src)})")
             skipped.append({"name": name, "reason": "missing in registry"})
             continue
         available_skills.append(name)
@@ -367,13 +1915,14 @@ def install_registry_skills(
     if not available_skills:
         return installed, skipped
 
-    if install_method == "local":
-        for name in available_skills:
-            src = skillregistry_root / "skills" / name
-            for t in targets:
-                dst = skill_dst(project_root, t, name)
-                if dst.exists():
-                    if not force_overwrite:
+    if install_method in ("local", "store"):
+        store = store_root() if install_method == "store" else None
+        with InstallTxn(project_root) as txn:
+            for name in available_skills:
+                entries = registry.tree(f"skills/{name}") if store is not None else []
+                for t in targets:
+                    dst = skill_dst(project_root, t, name)
+                    if dst.exists() and not force_overwrite:
                         skipped.append({"name": name, "reason": f"destination exists for {t}"})
                         todo.append(
                             f"- Registry skill `{name}` already exists for {t}; "
@@ -383,99 +1932,406 @@ def install_registry_skills(
                             installed.append(name)
                             seen_installed.add(name)
                         continue
-                    remove_path(dst)
-                ensure_dir(dst.parent)
-                copy_dir(src, dst)
-                if name not in seen_installed:
-                    installed.append(name)
-                    seen_installed.add(name)
+                    if store is None and dst.is_dir() and not dst.is_symlink():
+                        # Delta sync replaces changed files one rename at a time; no staging copy needed.
+                        sync_tree(registry, f"skills/{name}", dst)
+                    elif store is None:
+                        sync_tree(registry, f"skills/{name}", txn.stage(dst))
+                    else:
+                        install_from_store(registry, store, entries, txn.stage(dst))
+                    if name not in seen_installed:
+                        installed.append(name)
+                        seen_installed.add(name)
         return installed, skipped
 
-    helper = registry_installer_helper(skillregistry_root)
-    if not helper.exists():
+    if not registry.exists(REGISTRY_INSTALLER_HELPER):
         raise RuntimeError(
-            f"registry installer helper not found at {helper}. "
+            f"registry installer helper not found at {registry.describe(REGISTRY_INSTALLER_HELPER)}. "
             "Update the skillregistry clone or rerun with --install-method local."
         )
 
-    for t in targets:
-        dest_root = skills_root(project_root, t)
-        cmd = [
-            sys.executable,
-            str(helper),
-            "--repo",
-            DEFAULT_REGISTRY_REPO,
-            "--ref",
-            registry_ref,
-            "--dest",
-            str(dest_root),
-            "--json",
-        ]
-        if force_overwrite:
-            cmd.append("--force-overwrite-registry-skills")
-        for name in available_skills:
-            cmd.extend(["--skill", name])
+    with tempfile.TemporaryDirectory(prefix="skillregistry-helper-") as scratch:
+        helper = registry.local_path(REGISTRY_INSTALLER_HELPER, Path(scratch))
+        staging = Path(scratch) / "staging"
+        ensure_dir(staging)
+        with InstallTxn(project_root) as txn:
+            run_registry_installer(
+                helper,
+                project_root,
+                available_skills,
+                targets,
+                todo,
+                force_overwrite=force_overwrite,
+                registry_ref=registry_ref,
+                installed=installed,
+                skipped=skipped,
+                staging=staging,
+                txn=txn,
+            )
+    return installed, skipped
 
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+
+def load_registry_installer(helper: Path) -> Any:
+    spec = importlib.util.spec_from_file_location("skillregistry_install_registry_skills", helper)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to import registry installer helper from {helper}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def registry_installer_summary(
+    module: Any,
+    helper: Path,
+    dest_root: Path,
+    skills: List[str],
+    registry_ref: str,
+    force_overwrite: bool,
+) -> Dict[str, Any]:
+    if hasattr(module, "install"):
+        kwargs: Dict[str, Any] = {}
+        if hasattr(module, "DEFAULT_JOBS"):
+            # Helpers that ship DEFAULT_JOBS accept `jobs` and run per-skill installs concurrently.
+            kwargs["jobs"] = REGISTRY_INSTALL_JOBS
+        if hasattr(module, "install_from_archive") and not module.skill_installer_script().exists():
+            # Without the system skill-installer, fetch the registry archive once for every skill.
+            kwargs["method"] = "download"
+        result = module.install(
+            module.build_items(skills, []),
+            dest_root,
+            repo=DEFAULT_REGISTRY_REPO,
+            ref=registry_ref,
+            force_overwrite=force_overwrite,
+            **kwargs,
         )
+        if result.failed:
+            raise RuntimeError(format_registry_installer_failures(result.failed))
+        return {"installed": list(result.installed), "skipped": list(result.skipped), "failed": []}
+
+    # Registries pinned to a ref from before the importable API only ship the CLI.
+    cmd = [
+        sys.executable,
+        str(helper),
+        "--repo",
+        DEFAULT_REGISTRY_REPO,
+        "--ref",
+        registry_ref,
+        "--dest",
+        str(dest_root),
+        "--json",
+    ]
+    if force_overwrite:
+        cmd.append("--force-overwrite-registry-skills")
+    for name in skills:
+        cmd.extend(["--skill", name])
 
-        summary: Dict[str, Any] = {"installed": [], "skipped": [], "failed": []}
-        stdout = result.stdout.strip()
-        if stdout:
-            summary = parse_registry_installer_summary(stdout)
-        elif result.returncode == 0:
-            raise RuntimeError("install_registry_skills.py returned no JSON output")
-
-        failed_entries = summary.get("failed") or []
-        if result.returncode != 0 or failed_entries:
-            failure_reason = ""
-            if failed_entries:
-                failure_reason = format_registry_installer_failures(failed_entries)
-            elif result.stderr.strip():
-                failure_reason = result.stderr.strip()
-            else:
-                failure_reason = "install failed"
-            raise RuntimeError(f"Registry skill install failed for {t}: {failure_reason}")
+    proc = subprocess.run(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    summary: Dict[str, Any] = {"installed": [], "skipped": [], "failed": []}
+    stdout = proc.stdout.strip()
+    if stdout:
+        summary = parse_registry_installer_summary(stdout)
+    elif proc.returncode == 0:
+        raise RuntimeError("install_registry_skills.py returned no JSON output")
+
+    failed_entries = summary.get("failed") or []
+    if failed_entries:
+        raise RuntimeError(format_registry_installer_failures(failed_entries))
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or "install failed")
+    return summary
 
-        for name in summary.get("installed") or []:
-            if name not in seen_installed:
-                installed.append(name)
-                seen_installed.add(name)
 
-        for entry in summary.get("skipped") or []:
-            name = str(entry.get("name", "")).strip()
-            if not name:
-                continue
-            reason = str(entry.get("reason", "skipped"))
-            if reason == "destination exists":
-                reason = f"destination exists for {t}"
+def run_registry_installer(
+    helper: Path,
+    project_root: Path,
+    available_skills: List[str],
+    targets: List[str],
+    todo: List[str],
+    force_overwrite: bool,
+    registry_ref: str,
+    installed: List[str],
+    skipped: List[Dict[str, str]],
+    staging: Path,
+    txn: InstallTxn,
+) -> None:
+    present: Set[str] = set()
+    wanted: Dict[str, List[str]] = {}
+    for name in available_skills:
+        for t in targets:
+            dst = skill_dst(project_root, t, name)
+            if os.path.lexists(dst) and not force_overwrite:
+                skipped.append({"name": name, "reason": f"destination exists for {t}"})
                 todo.append(
                     f"- Registry skill `{name}` already exists for {t}; "
                     "not overwriting. Use `--force-overwrite-registry-skills` to replace."
                 )
-                dst = skill_dst(project_root, t, name)
-                if dst.is_dir() and name not in seen_installed:
-                    installed.append(name)
-                    seen_installed.add(name)
-            skipped.append({"name": name, "reason": reason})
-    return installed, skipped
+                if dst.is_dir():
+                    present.add(name)
+                continue
+            wanted.setdefault(name, []).append(t)
+    if wanted:
+        install_staged_registry_skills(helper, project_root, wanted, registry_ref, staging, txn, present, skipped)
+    seen_installed = set(installed)
+    installed.extend(name for name in available_skills if name in present and name not in seen_installed)
+
+
+def install_staged_registry_skills(
+    helper: Path,
+    project_root: Path,
+    wanted: Dict[str, List[str]],
+    registry_ref: str,
+    staging: Path,
+    txn: InstallTxn,
+    present: Set[str],
+    skipped: List[Dict[str, str]],
+) -> None:
+    module = load_registry_installer(helper)
+    try:
+        summary = registry_installer_summary(module, helper, staging, list(wanted), registry_ref, False)
+    except RuntimeError as exc:
+        targets = sorted({t for ts in wanted.values() for t in ts})
+        raise RuntimeError(f"Registry skill install failed for {', '.join(targets)}: {exc}") from exc
+
+    for name in summary.get("installed") or []:
+        staged = staging / name
+        dsts = [skill_dst(project_root, t, name) for t in wanted.get(name, [])]
+        for i, dst in enumerate(dsts):
+            # Existing copies are only swapped out when the whole transaction commits.
+            if i == len(dsts) - 1:
+                shutil.move(str(staged), str(txn.stage(dst)))
+            else:
+                shutil.copytree(staged, txn.stage(dst), symlinks=True)
+        if dsts:
+            present.add(name)
+
+    for entry in summary.get("skipped") or []:
+        name = str(entry.get("name", "")).strip()
+        if name:
+            skipped.append({"name": name, "reason": str(entry.get("reason", "skipped"))})
+
+
+# -------------------- install manifests & verify --------------------
+
+
+def stat_key(st: os.stat_result) -> List[int]:
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def file_digest(p: Path, st: os.stat_result) -> str:
+    if stat.S_ISLNK(st.st_mode):
+        return sha256_bytes(os.readlink(p).encode("utf-8"))
+    return sha256_file(p)
+
+
+def hash_files(items: List[Tuple[Path, os.stat_result]], jobs: Optional[int] = None) -> List[str]:
+    # hashlib releases the GIL on large buffers, so threads overlap both I/O and hashing.
+    if len(items) < 2 or jobs == 1:
+        return [file_digest(p, st) for p, st in items]
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(lambda item: file_digest(*item), items))
+
+
+def build_skill_manifests(
+    project_root: Path,
+    pairs: List[Tuple[str, str]],
+    prev_manifests: Dict[str, Any],
+    jobs: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    manifests: Dict[str, Dict[str, Any]] = {}
+    pending: List[Tuple[str, str, Path, os.stat_result]] = []
+    for target, name in pairs:
+        key = overlay_key(target, name)
+        dst = skill_dst(project_root, target, name)
+        prev = prev_manifests.get(key) or {}
+        manifest: Dict[str, Any] = {}
+        for rel, st in list_files(dst).items():
+            old = prev.get(rel)
+            if isinstance(old, dict) and old.get("stat") == stat_key(st):
+                manifest[rel] = old
+            else:
+                pending.append((key, rel, dst / rel, st))
+        manifests[key] = manifest
+    digests = hash_files([(p, st) for _, _, p, st in pending], jobs)
+    for (key, rel, _, st), digest in zip(pending, digests):
+        manifests[key][rel] = {"sha256": digest, "stat": stat_key(st)}
+    return {key: dict(sorted(files.items())) for key, files in manifests.items()}
+
+
+def manifests_unchanged(project_root: Path, manifests: Dict[str, Any]) -> bool:
+    for key, manifest in manifests.items():
+        target, name = key.split("/", 1)
+        present = list_files(skill_dst(project_root, target, name))
+        if set(present) != set(manifest):
+            return False
+        if any(manifest[rel].get("stat") != stat_key(st) for rel, st in present.items()):
+            return False
+    return True
+
+
+def installed_skills_present(project_root: Path, targets: List[str], prev_record: Any) -> bool:
+    # Kept skills (destination already existed) have no manifest, so check that every installed dir still exists.
+    result = prev_record.get("result") if isinstance(prev_record, dict) else None
+    names = (result or {}).get("installed") or []
+    return all(skill_dst(project_root, t, str(name)).is_dir() for t in targets for name in names)
+
+
+def verify_skills(project_root: Path, manifests: Dict[str, Any], jobs: Optional[int] = None) -> Dict[str, Any]:
+    started = time.perf_counter()
+    modified: List[str] = []
+    missing: List[str] = []
+    extra: List[str] = []
+    pending: List[Tuple[str, str, Path, os.stat_result]] = []
+    files_checked = 0
+    for key, manifest in sorted(manifests.items()):
+        target, name = key.split("/", 1)
+        dst = skill_dst(project_root, target, name)
+        present = list_files(dst)
+        missing += [f"{key}/{rel}" for rel in manifest if rel not in present]
+        for rel, st in sorted(present.items()):
+            expected = manifest.get(rel)
+            if expected is None:
+                extra.append(f"{key}/{rel}")
+                continue
+            files_checked += 1
+            if expected.get("stat") != stat_key(st):
+                pending.append((key, rel, dst / rel, st))
+    digests = hash_files([(p, st) for _, _, p, st in pending], jobs)
+    for (key, rel, _, _), digest in zip(pending, digests):
+        if digest != manifests[key][rel].get("sha256"):
+            modified.append(f"{key}/{rel}")
+    return {
+        "skills": len(manifests),
+        "files_checked": files_checked,
+        "files_hashed": len(pending),
+        "modified": sorted(modified),
+        "missing": missing,
+        "extra": extra,
+        "ok": not (modified or missing or extra),
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def run_verify(root: Path, args: argparse.Namespace) -> int:
+    state_path = root / ".agent" / "skills_state.json"
+    if not state_path.exists():
+        raise RuntimeError(f"{state_path} not found; run `bootstrap.py init` first")
+    # Shared lock: verifies run side by side, but never against a half-finished `init`.
+    with ProjectLock(root, exclusive=False):
+        manifests = load_prev_state(state_path).get("registry_skill_manifests") or {}
+        report = verify_skills(root, manifests, jobs=args.jobs)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(
+            f"Verified {report['files_checked']} files in {report['skills']} registry skills "
+            f"({report['files_hashed']} hashed) in {report['seconds']}s."
+        )
+        for kind in ("modified", "missing", "extra"):
+            for path in report[kind]:
+                print(f"{kind}: {path}")
+        if not report["ok"]:
+            print(
+                "Registry skills drifted from their install manifest; "
+                "rerun `bootstrap.py init --force-overwrite-registry-skills` to repair.",
+                file=sys.stderr,
+            )
+    return 0 if report["ok"] else 1
 
 
 # -------------------- overlay safe-write policy --------------------
 
 
-def render_template(skillregistry_root: Path, template_name: str, vars: Dict[str, str]) -> str:
-    tp = skillregistry_root / "templates" / template_name
-    if not tp.exists():
-        raise RuntimeError(f"Template not found: {tp}")
-    s = read_text(tp)
-    for k, v in vars.items():
-        s = s.replace(f"{{{{{k}}}}}", v)
-    return s
+OVERLAY_WRITE_JOBS = 16
+TEMPLATE_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+TEMPLATE_CACHE: Dict[Tuple[str, str], "CompiledTemplate"] = {}
+
+
+@dataclass
+class CompiledTemplate:
+    # Literal text at even indexes, placeholder names at odd indexes.
+    segments: List[str]
+
+    @property
+    def placeholders(self) -> Set[str]:
+        return set(self.segments[1::2])
+
+    def render(self, vars: Dict[str, str]) -> str:
+        return "".join(
+            vars.get(seg, f"{{{{{seg}}}}}") if i % 2 else seg for i, seg in enumerate(self.segments)
+        )
+
+
+def compile_template(text: str) -> CompiledTemplate:
+    return CompiledTemplate(TEMPLATE_PLACEHOLDER.split(text))
+
+
+def template_cache_path(revision: str) -> Path:
+    return user_cache_dir() / "templates" / f"{revision}.json"
+
+
+def load_template(registry: RegistryReader, template_name: str) -> CompiledTemplate:
+    revision = registry.revision
+    key = (revision or "", template_name)
+    if revision and key in TEMPLATE_CACHE:
+        return TEMPLATE_CACHE[key]
+
+    disk: Dict[str, Any] = {}
+    if revision:
+        try:
+            disk = json.loads(read_text(template_cache_path(revision)))
+        except (OSError, ValueError):
+            disk = {}
+        segments = disk.get(template_name)
+        if isinstance(segments, list) and len(segments) % 2 == 1:
+            TEMPLATE_CACHE[key] = CompiledTemplate([str(x) for x in segments])
+            return TEMPLATE_CACHE[key]
+
+    rel = f"templates/{template_name}"
+    text = registry.read_text(rel)
+    if text is None:
+        raise RuntimeError(f"Template not found: {registry.describe(rel)}")
+    compiled = compile_template(text)
+    if revision:
+        TEMPLATE_CACHE[key] = compiled
+        disk[template_name] = compiled.segments
+        try:
+            write_if_changed(template_cache_path(revision), json.dumps(disk, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+    return compiled
+
+
+def template_problems(template_name: str, compiled: CompiledTemplate, vars: Dict[str, str]) -> List[str]:
+    problems: List[str] = []
+    unknown = sorted(compiled.placeholders - set(vars))
+    unused = sorted(set(vars) - compiled.placeholders)
+    if unknown:
+        names = ", ".join(f"`{{{{{n}}}}}`" for n in unknown)
+        problems.append(f"- Template `{template_name}` has placeholders without a value (left as-is): {names}")
+    if unused:
+        names = ", ".join(f"`{n}`" for n in unused)
+        problems.append(f"- Template `{template_name}` does not use the variables: {names}")
+    return problems
+
+
+def render_template(
+    registry: RegistryReader,
+    template_name: str,
+    vars: Dict[str, str],
+    todo: Optional[List[str]] = None,
+) -> str:
+    compiled = load_template(registry, template_name)
+    if todo is not None:
+        todo.extend(line for line in template_problems(template_name, compiled, vars) if line not in todo)
+    return compiled.render(vars)
 
 
 def set_frontmatter_name(content: str, name: str) -> str:
@@ -504,25 +2360,53 @@ def set_frontmatter_name(content: str, name: str) -> str:
     return out
 
 
-def find_similar_overlays(project_root: Path, target: str, base_name: str) -> List[str]:
-    root = skills_root(project_root, target)
-    if not root.exists():
-        return []
-    matches: List[str] = []
-    suffix = f"-{base_name}"
-    for entry in root.iterdir():
-        if not entry.is_dir():
-            continue
-        name = entry.name
-        if name == base_name or name.endswith(suffix):
-            matches.append(name)
-    return matches
+class OverlayIndex:
+    # Skill dir names of one target, keyed by the name and every suffix after a `-`.
+    def __init__(self, root: Path) -> None:
+        self.names: Set[str] = set()
+        self.by_suffix: Dict[str, List[str]] = {}
+        if root.exists():
+            with os.scandir(root) as it:
+                entries = sorted(it, key=lambda e: e.name)
+            for entry in entries:
+                if entry.is_dir():
+                    self.add(entry.name)
+
+    def add(self, name: str) -> None:
+        if name in self.names:
+            return
+        self.names.add(name)
+        self.by_suffix.setdefault(name, []).append(name)
+        for i, ch in enumerate(name):
+            if ch == "-":
+                self.by_suffix.setdefault(name[i + 1 :], []).append(name)
+
+    def similar(self, base_name: str) -> List[str]:
+        return list(self.by_suffix.get(base_name, []))
+
+
+def overlay_index(indexes: Dict[str, OverlayIndex], project_root: Path, target: str) -> OverlayIndex:
+    if target not in indexes:
+        indexes[target] = OverlayIndex(skills_root(project_root, target))
+    return indexes[target]
 
 
 def overlay_key(target: str, overlay_name: str) -> str:
     return f"{target}/{overlay_name}"
 
 
+def overlay_hash(
+    dst_file: Path,
+    key: str,
+    prev_generated_hashes: Dict[str, str],
+    prev_generated_stats: Dict[str, List[int]],
+) -> str:
+    prev_gen = prev_generated_hashes.get(key)
+    if prev_gen and prev_generated_stats.get(key) == stat_key(os.stat(dst_file)):
+        return prev_gen
+    return sha256_file(dst_file)
+
+
 def safe_write_overlay(
     project_root: Path,
     target: str,
@@ -533,6 +2417,8 @@ def safe_write_overlay(
     todo: List[str],
     force: bool,
     adopt_existing: bool,
+    prev_generated_stats: Optional[Dict[str, List[int]]] = None,
+    new_generated_stats: Optional[Dict[str, List[int]]] = None,
 ) -> None:
     dst_dir = skill_dst(project_root, target, overlay_name)
     dst_file = dst_dir / "SKILL.md"
@@ -540,28 +2426,46 @@ def safe_write_overlay(
 
     key = overlay_key(target, overlay_name)
     prev_gen = prev_generated_hashes.get(key)
+    prev_stats = prev_generated_stats if prev_generated_stats is not None else {}
+    new_stats = new_generated_stats if new_generated_stats is not None else {}
+
+    def record(content_hash: str) -> None:
+        new_generated_hashes[key] = content_hash
+        new_stats[key] = stat_key(os.stat(dst_file))
+
+    new_hash = sha256_bytes(new_content.encode("utf-8"))
+
+    def write_generated(current_hash: Optional[str]) -> None:
+        if current_hash == new_hash:
+            WRITE_STATS.count(written=False)
+        else:
+            write_text_atomic(dst_file, new_content)
+            WRITE_STATS.count(written=True)
+        record(new_hash)
 
     if not dst_file.exists():
-        write_text(dst_file, new_content)
-        new_generated_hashes[key] = sha256_file(dst_file)
+        write_generated(None)
         return
 
     if force:
+        current_hash = overlay_hash(dst_file, key, prev_generated_hashes, prev_stats)
+        if current_hash == new_hash:
+            write_generated(current_hash)
+            return
         backup = dst_dir / "SKILL.md.bootstrap.bak"
-        write_text(backup, read_text(dst_file))
-        write_text(dst_file, new_content)
-        new_generated_hashes[key] = sha256_file(dst_file)
+        write_if_changed(backup, read_text(dst_file))
+        write_generated(current_hash)
         todo.append(f"- Overlay `{key}` overwritten due to --force-overwrite-overlays (backup: `{backup}`)")
         return
 
     if not prev_gen:
         if adopt_existing:
-            new_generated_hashes[key] = sha256_file(dst_file)
+            record(sha256_file(dst_file))
             todo.append(f"- Overlay `{key}` adopted as baseline (will auto-update only if unmodified later).")
             return
 
         pending = project_root / ".agent" / "overlays_pending" / target / overlay_name / "SKILL.md"
-        write_text(pending, new_content)
+        write_if_changed(pending, new_content)
         todo.append(
             f"- Overlay `{key}` exists but has no generation history; not overwriting. "
             f"New candidate written to `{pending}`. "
@@ -569,23 +2473,28 @@ def safe_write_overlay(
         )
         return
 
-    current_hash = sha256_file(dst_file)
+    current_hash = overlay_hash(dst_file, key, prev_generated_hashes, prev_stats)
     if current_hash == prev_gen:
-        write_text(dst_file, new_content)
-        new_generated_hashes[key] = sha256_file(dst_file)
+        write_generated(current_hash)
         return
 
     pending = project_root / ".agent" / "overlays_pending" / target / overlay_name / "SKILL.md"
-    write_text(pending, new_content)
+    write_if_changed(pending, new_content)
     new_generated_hashes[key] = prev_gen
+    # Edited by hand: drop the stat so the next run hashes it again.
+    new_stats.pop(key, None)
     todo.append(
         f"- Overlay `{key}` was modified; not overwriting. "
         f"New candidate written to `{pending}` (merge manually)."
     )
 
 
+def package_workflow_name(package: str) -> str:
+    return f"project-workflow-{slugify(package)}"
+
+
 def generate_project_workflow(
-    skillregistry_root: Path,
+    registry: RegistryReader,
     project_root: Path,
     targets: List[str],
     commands: Dict[str, str],
@@ -599,31 +2508,38 @@ def generate_project_workflow(
     prefix_changed: bool,
     prev_prefix: Optional[str],
     overlays_skipped: List[Dict[str, str]],
+    package: str = "",
+    prev_generated_stats: Optional[Dict[str, List[int]]] = None,
+    new_generated_stats: Optional[Dict[str, List[int]]] = None,
+    overlay_indexes: Optional[Dict[str, OverlayIndex]] = None,
 ) -> None:
     required = ["build", "test", "lint", "run"]
+    where = f"project-workflow for `{package}`" if package else "project-workflow"
     for r in required:
         if r not in commands or "TODO" in commands[r]:
-            todo.append(
-                f"- Verify command `{r}` in project-workflow (auto-inferred: `{commands.get(r, '<missing>')}`)"
-            )
+            todo.append(f"- Verify command `{r}` in {where} (auto-inferred: `{commands.get(r, '<missing>')}`)")
 
-    base_name = "project-workflow"
+    base_name = package_workflow_name(package) if package else "project-workflow"
+    cd = f"cd {package} && " if package else ""
     body = render_template(
-        skillregistry_root,
+        registry,
         "project-workflow.SKILL.template.md",
         {
-            "BUILD_CMD": commands.get("build", "TODO"),
-            "TEST_CMD": commands.get("test", "TODO"),
-            "LINT_CMD": commands.get("lint", "TODO"),
-            "RUN_CMD": commands.get("run", "TODO"),
+            "BUILD_CMD": cd + commands.get("build", "TODO"),
+            "TEST_CMD": cd + commands.get("test", "TODO"),
+            "LINT_CMD": cd + commands.get("lint", "TODO"),
+            "RUN_CMD": cd + commands.get("run", "TODO"),
         },
+        todo,
     )
 
+    indexes = overlay_indexes if overlay_indexes is not None else {}
     for t in targets:
         overlay_name = prefixed_overlay_name(project_prefix, base_name)
         body_with_name = set_frontmatter_name(body, overlay_name)
         dst_dir = skill_dst(project_root, t, overlay_name)
-        similar = [name for name in find_similar_overlays(project_root, t, base_name) if name != overlay_name]
+        index = overlay_index(indexes, project_root, t)
+        similar = [name for name in index.similar(base_name) if name != overlay_name]
         if not dst_dir.exists() and similar and not force_create_overlays and not prefix_changed:
             reason = f"similar overlay exists: {', '.join(similar)}"
             overlays_skipped.append({"name": f"{t}/{overlay_name}", "reason": reason})
@@ -648,11 +2564,56 @@ def generate_project_workflow(
             todo=todo,
             force=force_overwrite,
             adopt_existing=adopt_existing,
+            prev_generated_stats=prev_generated_stats,
+            new_generated_stats=new_generated_stats,
+        )
+        index.add(overlay_name)
+
+
+@dataclass
+class OverlayWrite:
+    target: str
+    overlay_name: str
+    content: str
+    todo: List[str] = field(default_factory=list)
+    hashes: Dict[str, str] = field(default_factory=dict)
+    stats: Dict[str, List[int]] = field(default_factory=dict)
+
+
+def write_api_overlay(
+    project_root: Path,
+    job: OverlayWrite,
+    prev_generated_hashes: Dict[str, str],
+    prev_generated_stats: Optional[Dict[str, List[int]]],
+    force_overwrite: bool,
+    adopt_existing: bool,
+) -> None:
+    dst_dir = skill_dst(project_root, job.target, job.overlay_name)
+    ensure_dir(dst_dir / "references")
+    safe_write_overlay(
+        project_root=project_root,
+        target=job.target,
+        overlay_name=job.overlay_name,
+        new_content=job.content,
+        prev_generated_hashes=prev_generated_hashes,
+        new_generated_hashes=job.hashes,
+        todo=job.todo,
+        force=force_overwrite,
+        adopt_existing=adopt_existing,
+        prev_generated_stats=prev_generated_stats,
+        new_generated_stats=job.stats,
+    )
+
+    ref_todo = dst_dir / "references" / "TODO.md"
+    if not ref_todo.exists():
+        write_text(
+            ref_todo,
+            "Fill: base_url, auth method, endpoints, rate limits, idempotency rules, errors.\n",
         )
 
 
 def generate_api_skeletons(
-    skillregistry_root: Path,
+    registry: RegistryReader,
     project_root: Path,
     targets: List[str],
     detected: Detected,
@@ -666,10 +2627,18 @@ def generate_api_skeletons(
     prefix_changed: bool,
     prev_prefix: Optional[str],
     overlays_skipped: List[Dict[str, str]],
+    prev_generated_stats: Optional[Dict[str, List[int]]] = None,
+    new_generated_stats: Optional[Dict[str, List[int]]] = None,
+    overlay_indexes: Optional[Dict[str, OverlayIndex]] = None,
 ) -> None:
+    indexes = overlay_indexes if overlay_indexes is not None else {}
     if detected.openapi_files:
         todo.append("- Found OpenAPI/Swagger files:\n  " + "\n  ".join([f"* `{p}`" for p in detected.openapi_files]))
 
+    # Plan in order first so TODO lines do not depend on which write finishes first.
+    plan: List[Union[str, OverlayWrite]] = []
+    jobs: List[OverlayWrite] = []
+    planned: Set[str] = set()
     for api in detected.apis:
         name = normalize_api_name(api)
         if not name:
@@ -677,114 +2646,283 @@ def generate_api_skeletons(
 
         base_name = f"api-{name}"
         overlay_name = prefixed_overlay_name(project_prefix, base_name)
-        body = render_template(skillregistry_root, "api-skeleton.SKILL.template.md", {"API_NAME": name})
+        body = render_template(registry, "api-skeleton.SKILL.template.md", {"API_NAME": name}, todo)
+        body_with_name = set_frontmatter_name(body, overlay_name)
         created_any = False
 
         for t in targets:
-            body_with_name = set_frontmatter_name(body, overlay_name)
+            key = overlay_key(t, overlay_name)
+            if key in planned:
+                continue
             dst_dir = skill_dst(project_root, t, overlay_name)
-            similar = [s for s in find_similar_overlays(project_root, t, base_name) if s != overlay_name]
+            index = overlay_index(indexes, project_root, t)
+            similar = [s for s in index.similar(base_name) if s != overlay_name]
             if not dst_dir.exists() and similar and not force_create_overlays and not prefix_changed:
                 reason = f"similar overlay exists: {', '.join(similar)}"
                 overlays_skipped.append({"name": f"{t}/{overlay_name}", "reason": reason})
-                todo.append(
+                plan.append(
                     f"- Overlay `{t}/{overlay_name}` skipped because similar overlay exists: {', '.join(similar)}. "
                     "Use `--force-create-overlays` to create anyway."
                 )
                 continue
             if prefix_changed and similar:
                 prev = prev_prefix or "<unknown>"
-                todo.append(
+                plan.append(
                     f"- Overlay prefix changed from `{prev}` to `{project_prefix}` for `{t}/{base_name}`; "
                     f"existing overlays not renamed: {', '.join(similar)}. Review/migrate manually."
                 )
-            ensure_dir(dst_dir / "references")
-
-            safe_write_overlay(
-                project_root=project_root,
-                target=t,
-                overlay_name=overlay_name,
-                new_content=body_with_name,
-                prev_generated_hashes=prev_generated_hashes,
-                new_generated_hashes=new_generated_hashes,
-                todo=todo,
-                force=force_overwrite,
-                adopt_existing=adopt_existing,
-            )
+            job = OverlayWrite(target=t, overlay_name=overlay_name, content=body_with_name)
+            if key in new_generated_hashes:
+                job.hashes[key] = new_generated_hashes[key]
+            if new_generated_stats is not None and key in new_generated_stats:
+                job.stats[key] = new_generated_stats[key]
+            plan.append(job)
+            jobs.append(job)
+            planned.add(key)
+            index.add(overlay_name)
             created_any = True
 
-            ref_todo = dst_dir / "references" / "TODO.md"
-            if not ref_todo.exists():
-                write_text(
-                    ref_todo,
-                    "Fill: base_url, auth method, endpoints, rate limits, idempotency rules, errors.\n",
-                )
-
         if created_any:
-            todo.append(f"- API skill overlay ensured: `{overlay_name}` (needs docs/scheme enrichment)")
+            plan.append(f"- API skill overlay ensured: `{overlay_name}` (needs docs/scheme enrichment)")
+
+    def write_overlay_job(job: OverlayWrite) -> None:
+        write_api_overlay(
+            project_root,
+            job,
+            prev_generated_hashes,
+            prev_generated_stats,
+            force_overwrite,
+            adopt_existing,
+        )
+
+    if len(jobs) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(OVERLAY_WRITE_JOBS, len(jobs))) as pool:
+            list(pool.map(write_overlay_job, jobs))
+    else:
+        for job in jobs:
+            write_overlay_job(job)
+
+    for item in plan:
+        if isinstance(item, str):
+            todo.append(item)
+            continue
+        todo.extend(item.todo)
+        key = overlay_key(item.target, item.overlay_name)
+        if key in item.hashes:
+            new_generated_hashes[key] = item.hashes[key]
+        else:
+            new_generated_hashes.pop(key, None)
+        if new_generated_stats is not None:
+            if key in item.stats:
+                new_generated_stats[key] = item.stats[key]
+            else:
+                new_generated_stats.pop(key, None)
+
+
+# -------------------- batch bootstrap --------------------
+
+
+def read_roots(args: argparse.Namespace) -> List[str]:
+    roots: List[str] = list(args.roots)
+    if args.roots_file:
+        raw = sys.stdin.read() if args.roots_file == "-" else read_text(Path(args.roots_file))
+        roots += [line.strip() for line in raw.splitlines() if line.strip() and not line.startswith("#")]
+    seen = set()
+    out: List[str] = []
+    for r in roots:
+        resolved = str(Path(r).expanduser().resolve())
+        if resolved not in seen:
+            seen.add(resolved)
+            out.append(resolved)
+    return out
+
+
+def init_many_worker(root: str, args: argparse.Namespace, seed: Tuple[Path, str]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        if not Path(root).is_dir():
+            raise RuntimeError(f"Project root not found: {root}")
+        state = run_init(Path(root), args, registry_seed=seed)
+    except Exception as exc:
+        return {
+            "root": root,
+            "status": "failed",
+            "seconds": round(time.perf_counter() - started, 3),
+            "error": str(exc),
+        }
+    return {
+        "root": root,
+        "status": "ok",
+        "seconds": round(time.perf_counter() - started, 3),
+        "commit": state["skillregistry"]["commit"],
+        "registry_skills_installed": state["registry_skills_installed"],
+    }
+
+
+def run_init_many(args: argparse.Namespace) -> int:
+    roots = read_roots(args)
+    if not roots:
+        raise RuntimeError("init-many: no project roots given (pass paths or --roots-file)")
+    if not args.skillregistry_git:
+        raise RuntimeError("Missing --skillregistry-git (or env SKILLREGISTRY_GIT)")
+    split_targets([t.strip() for t in args.targets.split(",") if t.strip()])
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="skillregistry-seed-") as tmp:
+        if args.registry_mirror:
+            mirror = update_mirror(args.skillregistry_git)
+            seed = (mirror, resolve_commit(mirror, args.skillregistry_ref))
+        else:
+            seed = fetch_registry_seed(Path(tmp) / "registry", args.skillregistry_git, args.skillregistry_ref)
+        fetch_seconds = time.perf_counter() - started
+        jobs = min(args.jobs, len(roots))
+        if jobs == 1:
+            results = [init_many_worker(r, args, seed) for r in roots]
+        else:
+            # Imported here: multiprocessing adds ~20ms to every single-project `init` startup.
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(init_many_worker, r, args, seed) for r in roots]
+                results = [f.result() for f in futures]
+
+    failed = [r for r in results if r["status"] != "ok"]
+    summary = {
+        "skillregistry": {"git": args.skillregistry_git, "ref": args.skillregistry_ref, "commit": seed[1]},
+        "jobs": jobs,
+        "fetch_seconds": round(fetch_seconds, 3),
+        "seconds": round(time.perf_counter() - started, 3),
+        "ok": len(results) - len(failed),
+        "failed": len(failed),
+        "results": results,
+    }
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 1 if failed else 0
 
 
 # -------------------- entrypoint --------------------
 
 
-def main() -> int:
-    ap = argparse.ArgumentParser()
-    sub = ap.add_subparsers(dest="cmd", required=True)
+def positive_int(value: str) -> int:
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    return n
 
-    init = sub.add_parser("init")
-    init.add_argument("--targets", default="codex,claude", help="comma-separated: codex,claude")
-    init.add_argument(
+
+def add_init_arguments(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--targets", default="codex,claude", help="comma-separated: codex,claude")
+    p.add_argument(
         "--skillregistry-git",
         default=os.environ.get("SKILLREGISTRY_GIT", ""),
         help="git url or local path (or env SKILLREGISTRY_GIT)",
     )
-    init.add_argument(
+    p.add_argument(
         "--skillregistry-ref",
         default=os.environ.get("SKILLREGISTRY_REF", "main"),
         help="branch/tag/commit (or env SKILLREGISTRY_REF)",
     )
-    init.add_argument(
+    p.add_argument(
+        "--registry-mirror",
+        action="store_true",
+        default=os.environ.get("SKILLREGISTRY_MIRROR", "") not in ("", "0"),
+        help="borrow registry objects from a shared per-user bare mirror (or env SKILLREGISTRY_MIRROR=1)",
+    )
+    p.add_argument(
+        "--registry-read",
+        choices=list(REGISTRY_READ_MODES),
+        default="worktree",
+        help="read registry files from a checkout (default) or straight from git objects without checking out",
+    )
+    p.add_argument(
         "--install-method",
-        choices=["skill-installer", "local"],
+        choices=list(INSTALL_METHODS),
         default="skill-installer",
-        help="install registry skills via skill-installer (default) or local copy",
+        help="install registry skills via skill-installer (default), local copy, or links into the shared store",
     )
-    init.add_argument(
+    p.add_argument(
         "--force-overwrite-registry-skills",
         action="store_true",
         help="overwrite registry skills even if they already exist",
     )
-    init.add_argument(
+    p.add_argument(
         "--force-overwrite-overlays",
         action="store_true",
         help="overwrite overlays even if modified (writes backup)",
     )
-    init.add_argument(
+    p.add_argument(
         "--force-create-overlays",
         action="store_true",
         help="create overlays even if similar overlays already exist",
     )
-    init.add_argument(
+    p.add_argument(
         "--adopt-existing-overlays",
         action="store_true",
         help="if overlay exists but has no generation history, adopt current as baseline",
     )
-    init.add_argument(
+    p.add_argument(
         "--project-prefix",
         default="",
         help="override project prefix used for overlays",
     )
-    init.add_argument(
+    p.add_argument(
         "--no-clean-stale-registry-skills",
         action="store_true",
         help="do not remove previously installed registry skills that are no longer selected",
     )
+    p.add_argument(
+        "--no-detect-cache",
+        action="store_true",
+        help="rescan the whole project instead of reusing .agent/detect_cache.json",
+    )
+    p.add_argument(
+        "--scan-workers",
+        type=positive_int,
+        default=1,
+        help="threads used to walk the project tree during detection (useful on network filesystems)",
+    )
+    p.add_argument(
+        "--detect-source",
+        choices=list(DETECT_SOURCES),
+        default="filesystem",
+        help="take the file list from the working tree, the git index, or the index when available (auto)",
+    )
+    p.add_argument(
+        "--workspace",
+        action="store_true",
+        help="monorepo mode: detect every package with its own manifest and generate per-package workflows",
+    )
 
-    args = ap.parse_args()
-    root = repo_root()
+
+def run_init(root: Path, args: argparse.Namespace, registry_seed: Optional[Tuple[Path, str]] = None) -> Dict[str, Any]:
+    key = init_request_key(root, args)
+    with ProjectLock(root, exclusive=True) as lock:
+        state_path = root / ".agent" / "skills_state.json"
+        if lock.started_while_waiting(key) and state_path.exists():
+            state = load_prev_state(state_path)
+            if state:
+                state["reused_concurrent_run"] = True
+                return state
+        state = init_project(root, args, registry_seed)
+        lock.record_run(key)
+        return state
+
+
+def init_project(
+    root: Path,
+    args: argparse.Namespace,
+    registry_seed: Optional[Tuple[Path, str]] = None,
+) -> Dict[str, Any]:
+    WRITE_STATS.written = WRITE_STATS.skipped = 0
     ensure_dir(root / ".agent")
     ensure_dir(root / ".codex" / "skills")
     ensure_dir(root / ".claude" / "skills")
+    recovered = recover_txn(root)
 
     targets = [t.strip() for t in args.targets.split(",") if t.strip()]
     supported_targets, unsupported_targets = split_targets(targets)
@@ -800,86 +2938,301 @@ def main() -> int:
     project_prefix = args.project_prefix or prev_prefix or infer_project_prefix(root)
     prefix_changed = prev_prefix is not None and prev_prefix != project_prefix
 
-    sr_root, sr_commit = ensure_skillregistry(root, args.skillregistry_git, args.skillregistry_ref)
-
-    detected = detect_project(root)
-    commands = infer_commands(root, detected)
-    skillsets = load_skillsets(sr_root)
-    registry_skills_selected = select_registry_skills(detected, skillsets)
-
-    todo: List[str] = []
-    cleaned: List[str] = []
-    if unsupported_targets:
-        for t in unsupported_targets:
-            todo.append(f"- Target `{t}` is not supported yet; skipping registry installs and overlays.")
-
-    if not args.no_clean_stale_registry_skills and supported_targets:
-        clean_stale_registry_skills(root, supported_targets, prev_state, registry_skills_selected, cleaned)
+    prev_registry = prev_state.get("skillregistry") or {}
+    prev_commit = None
+    if prev_registry.get("git") == args.skillregistry_git:
+        prev_commit = str(prev_registry.get("commit") or "") or None
+    phases = PhaseLog(prev=prev_state.get("phases") or {})
+    ref = args.skillregistry_ref
+    sr_root = root / ".agent" / "skillregistry"
+
+    # Only a pinned commit can be reused without asking the remote; branches and tags always fetch.
+    fingerprint, reused = phases.reuse(
+        root,
+        "registry",
+        {"git": args.skillregistry_git, "ref": ref, "read": args.registry_read, "mirror": args.registry_mirror},
+        valid=lambda: is_full_sha(ref)
+        and prev_commit == ref
+        and (read_head_commit(sr_root) == ref if args.registry_read == "worktree" else has_commit(sr_root, ref)),
+    )
+    if reused:
+        sr_commit = ref
+    else:
+        sr_root, sr_commit = ensure_skillregistry(
+            root,
+            args.skillregistry_git,
+            ref,
+            seed=registry_seed,
+            use_mirror=args.registry_mirror,
+            prev_commit=prev_commit,
+            checkout=args.registry_read == "worktree",
+        )
+        phases.record("registry", fingerprint, {}, [], {"commit": sr_commit})
+
+    with RegistryReader(sr_root, sr_commit if args.registry_read == "objects" else None, head=sr_commit) as registry:
+        registry.prefetch(REGISTRY_SPARSE_DIRS)
+        # Detection is never skipped: its per-directory cache is what tells whether the tree changed.
+        phases.ran.append("detect")
+        detect_cache = None if args.no_detect_cache else root / ".agent" / "detect_cache.json"
+        workspace = detect_workspace(
+            root,
+            cache_path=detect_cache,
+            scan_workers=args.scan_workers,
+            source=args.detect_source,
+            find_packages=args.workspace,
+        )
+        detected = merge_detected(workspace)
+        commands = infer_commands(root, workspace.root)
+        package_commands = infer_package_commands(root, workspace)
+        skillsets = load_skillsets(registry)
+        registry_skills_selected = select_registry_skills(detected, skillsets)
+
+        todo: List[str] = []
+        if recovered:
+            todo.append(f"- An interrupted skill install was rolled {recovered} from `.agent/{TXN_DIR}`.")
+        if unsupported_targets:
+            for t in unsupported_targets:
+                todo.append(f"- Target `{t}` is not supported yet; skipping registry installs and overlays.")
+
+        clean_enabled = not args.no_clean_stale_registry_skills and bool(supported_targets)
+        fingerprint, reused = phases.reuse(
+            root,
+            "clean",
+            {
+                "enabled": clean_enabled,
+                "targets": supported_targets,
+                "stale": [
+                    str(s) for s in prev_state.get("registry_skills_installed") or [] if s not in registry_skills_selected
+                ],
+            },
+        )
+        if reused:
+            cleaned: List[str] = list(reused["result"]["cleaned"])
+        else:
+            cleaned = []
+            if clean_enabled:
+                clean_stale_registry_skills(root, supported_targets, prev_state, registry_skills_selected, cleaned)
+            phases.record("clean", fingerprint, {}, [], {"cleaned": cleaned})
 
-    registry_skills_installed: List[str] = []
-    registry_skills_skipped: List[Dict[str, str]] = []
-    if supported_targets:
-        registry_skills_installed, registry_skills_skipped = install_registry_skills(
-            sr_root,
+        prev_manifests: Dict[str, Any] = prev_state.get("registry_skill_manifests") or {}
+        fingerprint, reused = phases.reuse(
             root,
-            registry_skills_selected,
-            supported_targets,
-            todo,
-            install_method=args.install_method,
-            force_overwrite=args.force_overwrite_registry_skills,
-            registry_ref=args.skillregistry_ref,
+            "install",
+            {
+                "commit": sr_commit,
+                "selected": registry_skills_selected,
+                "targets": supported_targets,
+                "method": args.install_method,
+                "ref": ref,
+                "force": args.force_overwrite_registry_skills,
+            },
+            valid=lambda: manifests_unchanged(root, prev_manifests)
+            and installed_skills_present(root, supported_targets, phases.prev.get("install")),
         )
+        if reused:
+            install_todo: List[str] = list(reused["todo"])
+            registry_skills_installed: List[str] = list(reused["result"]["installed"])
+            registry_skills_skipped: List[Dict[str, str]] = list(reused["result"]["skipped"])
+            registry_skill_manifests = prev_manifests
+        else:
+            install_todo = []
+            registry_skills_installed = []
+            registry_skills_skipped = []
+            if registry.commit is None:
+                sparse_checkout_registry(sr_root, registry_skills_selected)
+            else:
+                registry.prefetch([f"skills/{name}" for name in registry_skills_selected])
+            if supported_targets:
+                registry_skills_installed, registry_skills_skipped = install_registry_skills(
+                    registry,
+                    root,
+                    registry_skills_selected,
+                    supported_targets,
+                    install_todo,
+                    install_method=args.install_method,
+                    force_overwrite=args.force_overwrite_registry_skills,
+                    registry_ref=ref,
+                )
 
-    prev_gen_hashes: Dict[str, str] = prev_state.get("overlay_generated_hashes") or {}
-    prev_gen_hashes = {str(k): str(v) for k, v in prev_gen_hashes.items()}
-
-    new_gen_hashes: Dict[str, str] = dict(prev_gen_hashes)
-    overlays_skipped: List[Dict[str, str]] = []
-    if unsupported_targets:
-        for t in unsupported_targets:
-            pw_name = prefixed_overlay_name(project_prefix, "project-workflow")
-            overlays_skipped.append({"name": f"{t}/{pw_name}", "reason": "unsupported target"})
-            for api in detected.apis:
-                name = normalize_api_name(api)
-                if name:
-                    api_name = prefixed_overlay_name(project_prefix, f"api-{name}")
-                    overlays_skipped.append({"name": f"{t}/{api_name}", "reason": "unsupported target"})
-
-    if supported_targets:
-        generate_project_workflow(
-            skillregistry_root=sr_root,
-            project_root=root,
-            targets=supported_targets,
-            commands=commands,
-            todo=todo,
-            prev_generated_hashes=prev_gen_hashes,
-            new_generated_hashes=new_gen_hashes,
-            force_overwrite=args.force_overwrite_overlays,
-            adopt_existing=args.adopt_existing_overlays,
-            project_prefix=project_prefix,
-            force_create_overlays=args.force_create_overlays,
-            prefix_changed=prefix_changed,
-            prev_prefix=prev_prefix,
-            overlays_skipped=overlays_skipped,
+            # Skills left in place because they already existed keep the manifest of the run that installed them.
+            kept = {
+                (t, entry["name"])
+                for t in supported_targets
+                for entry in registry_skills_skipped
+                if entry["reason"] == f"destination exists for {t}"
+            }
+            registry_skill_manifests = build_skill_manifests(
+                root,
+                [(t, name) for t in supported_targets for name in registry_skills_installed if (t, name) not in kept],
+                prev_manifests,
+            )
+            for t, name in sorted(kept):
+                key = overlay_key(t, name)
+                if key in prev_manifests:
+                    registry_skill_manifests[key] = prev_manifests[key]
+            phases.record(
+                "install",
+                fingerprint,
+                {},
+                install_todo,
+                {"installed": registry_skills_installed, "skipped": registry_skills_skipped},
+            )
+        todo += install_todo
+
+        prev_gen_hashes: Dict[str, str] = prev_state.get("overlay_generated_hashes") or {}
+        prev_gen_hashes = {str(k): str(v) for k, v in prev_gen_hashes.items()}
+
+        new_gen_hashes: Dict[str, str] = dict(prev_gen_hashes)
+        prev_gen_stats: Dict[str, List[int]] = {
+            str(k): [int(x) for x in v]
+            for k, v in (prev_state.get("overlay_generated_stats") or {}).items()
+            if isinstance(v, list)
+        }
+        new_gen_stats: Dict[str, List[int]] = dict(prev_gen_stats)
+        overlays_skipped: List[Dict[str, str]] = []
+        overlay_indexes: Dict[str, OverlayIndex] = {}
+        if unsupported_targets:
+            for t in unsupported_targets:
+                pw_name = prefixed_overlay_name(project_prefix, "project-workflow")
+                overlays_skipped.append({"name": f"{t}/{pw_name}", "reason": "unsupported target"})
+                for package in package_commands:
+                    pkg_name = prefixed_overlay_name(project_prefix, package_workflow_name(package))
+                    overlays_skipped.append({"name": f"{t}/{pkg_name}", "reason": "unsupported target"})
+                for api in detected.apis:
+                    name = normalize_api_name(api)
+                    if name:
+                        api_name = prefixed_overlay_name(project_prefix, f"api-{name}")
+                        overlays_skipped.append({"name": f"{t}/{api_name}", "reason": "unsupported target"})
+
+        workflow_names = [prefixed_overlay_name(project_prefix, "project-workflow")] + [
+            prefixed_overlay_name(project_prefix, package_workflow_name(package)) for package in package_commands
+        ]
+        api_names = [
+            prefixed_overlay_name(project_prefix, f"api-{normalize_api_name(api)}")
+            for api in detected.apis
+            if normalize_api_name(api)
+        ]
+        overlay_inputs = {
+            "commit": sr_commit,
+            "targets": supported_targets,
+            "prefix": project_prefix,
+            "prefix_changed_from": prev_prefix if prefix_changed else None,
+            "force_overwrite": args.force_overwrite_overlays,
+            "force_create": args.force_create_overlays,
+            "adopt_existing": args.adopt_existing_overlays,
+            "skills": skill_dir_listing(root, supported_targets, set(workflow_names) | set(api_names)),
+        }
+
+        workflow_outputs = [skill_dst(root, t, n) / "SKILL.md" for t in supported_targets for n in workflow_names]
+        fingerprint, reused = phases.reuse(
+            root,
+            "workflow",
+            dict(overlay_inputs, commands=commands, packages=package_commands),
         )
+        if reused:
+            todo += reused["todo"]
+            overlays_skipped += reused["result"]["overlays_skipped"]
+        else:
+            workflow_todo: List[str] = []
+            workflow_skipped: List[Dict[str, str]] = []
+            if supported_targets:
+                generate_project_workflow(
+                    registry=registry,
+                    project_root=root,
+                    targets=supported_targets,
+                    commands=commands,
+                    todo=workflow_todo,
+                    prev_generated_hashes=prev_gen_hashes,
+                    new_generated_hashes=new_gen_hashes,
+                    prev_generated_stats=prev_gen_stats,
+                    new_generated_stats=new_gen_stats,
+                    overlay_indexes=overlay_indexes,
+                    force_overwrite=args.force_overwrite_overlays,
+                    adopt_existing=args.adopt_existing_overlays,
+                    project_prefix=project_prefix,
+                    force_create_overlays=args.force_create_overlays,
+                    prefix_changed=prefix_changed,
+                    prev_prefix=prev_prefix,
+                    overlays_skipped=workflow_skipped,
+                )
 
-        if detected.apis or detected.openapi_files:
-            generate_api_skeletons(
-                skillregistry_root=sr_root,
-                project_root=root,
-                targets=supported_targets,
-                detected=detected,
-                todo=todo,
-                prev_generated_hashes=prev_gen_hashes,
-                new_generated_hashes=new_gen_hashes,
-                force_overwrite=args.force_overwrite_overlays,
-                adopt_existing=args.adopt_existing_overlays,
-                project_prefix=project_prefix,
-                force_create_overlays=args.force_create_overlays,
-                prefix_changed=prefix_changed,
-                prev_prefix=prev_prefix,
-                overlays_skipped=overlays_skipped,
+                for package, package_cmds in package_commands.items():
+                    generate_project_workflow(
+                        registry=registry,
+                        project_root=root,
+                        targets=supported_targets,
+                        commands=package_cmds,
+                        todo=workflow_todo,
+                        prev_generated_hashes=prev_gen_hashes,
+                        new_generated_hashes=new_gen_hashes,
+                        prev_generated_stats=prev_gen_stats,
+                        new_generated_stats=new_gen_stats,
+                        overlay_indexes=overlay_indexes,
+                        force_overwrite=args.force_overwrite_overlays,
+                        adopt_existing=args.adopt_existing_overlays,
+                        project_prefix=project_prefix,
+                        force_create_overlays=args.force_create_overlays,
+                        prefix_changed=prefix_changed,
+                        prev_prefix=prev_prefix,
+                        overlays_skipped=workflow_skipped,
+                        package=package,
+                    )
+            phases.record(
+                "workflow",
+                fingerprint,
+                stat_outputs(root, workflow_outputs),
+                workflow_todo,
+                {"overlays_skipped": workflow_skipped},
             )
+            todo += workflow_todo
+            overlays_skipped += workflow_skipped
+
+        api_outputs = [
+            skill_dst(root, t, n) / rel
+            for t in supported_targets
+            for n in api_names
+            for rel in ("SKILL.md", "references/TODO.md")
+        ]
+        fingerprint, reused = phases.reuse(
+            root,
+            "api",
+            dict(overlay_inputs, apis=detected.apis, openapi_files=detected.openapi_files),
+        )
+        if reused:
+            todo += reused["todo"]
+            overlays_skipped += reused["result"]["overlays_skipped"]
+        else:
+            api_todo: List[str] = []
+            api_skipped: List[Dict[str, str]] = []
+            if supported_targets and (detected.apis or detected.openapi_files):
+                generate_api_skeletons(
+                    registry=registry,
+                    project_root=root,
+                    targets=supported_targets,
+                    detected=detected,
+                    todo=api_todo,
+                    prev_generated_hashes=prev_gen_hashes,
+                    new_generated_hashes=new_gen_hashes,
+                    prev_generated_stats=prev_gen_stats,
+                    new_generated_stats=new_gen_stats,
+                    overlay_indexes=overlay_indexes,
+                    force_overwrite=args.force_overwrite_overlays,
+                    adopt_existing=args.adopt_existing_overlays,
+                    project_prefix=project_prefix,
+                    force_create_overlays=args.force_create_overlays,
+                    prefix_changed=prefix_changed,
+                    prev_prefix=prev_prefix,
+                    overlays_skipped=api_skipped,
+                )
+            phases.record(
+                "api",
+                fingerprint,
+                stat_outputs(root, api_outputs),
+                api_todo,
+                {"overlays_skipped": api_skipped},
+            )
+            todo += api_todo
+            overlays_skipped += api_skipped
 
     profile = {
         "repo_root": str(root),
@@ -891,30 +3244,108 @@ def main() -> int:
             "openapi_files": detected.openapi_files,
         },
         "inferred_commands": commands,
+        "scan": {"source": detected.scan.source, "pruned_dirs": detected.scan.pruned_dirs},
     }
-    write_text(root / ".agent" / "project_profile.json", json.dumps(profile, indent=2, ensure_ascii=False) + "\n")
+    if args.workspace:
+        profile["packages"] = {
+            package: {
+                "languages": pkg.languages,
+                "has_docker": pkg.has_docker,
+                "apis": pkg.apis,
+                "openapi_files": pkg.openapi_files,
+                "inferred_commands": package_commands[package],
+            }
+            for package, pkg in workspace.packages.items()
+        }
+    profile_text = json.dumps(profile, indent=2, ensure_ascii=False) + "\n"
+    todo_text = "# TODO after bootstrap\n\n" + ("\n".join(todo) if todo else "(no todo)") + "\n"
+    profile_path = root / ".agent" / "project_profile.json"
+    todo_path = root / ".agent" / "skills_todo.md"
+    fingerprint, reused = phases.reuse(root, "write", {"profile": profile_text, "todo": todo_text})
+    if not reused:
+        write_if_changed(profile_path, profile_text)
+        write_if_changed(todo_path, todo_text)
+        phases.record("write", fingerprint, stat_outputs(root, [profile_path, todo_path]), [], {})
 
     state = {
-        "skillregistry": {"git": args.skillregistry_git, "ref": args.skillregistry_ref, "commit": sr_commit},
+        "skillregistry": {"git": args.skillregistry_git, "ref": ref, "commit": sr_commit},
         "targets": targets,
         "project_prefix": project_prefix,
         "install_method": args.install_method,
+        "workspace_packages": list(package_commands),
         "registry_skills_selected": registry_skills_selected,
         "registry_skills_installed": registry_skills_installed,
         "registry_skills_skipped": registry_skills_skipped,
+        "registry_skill_manifests": registry_skill_manifests,
         "unsupported_targets": unsupported_targets,
         "overlays_skipped": overlays_skipped,
         "cleaned_registry_skills": cleaned,
         "overlay_generated_hashes": new_gen_hashes,
+        "overlay_generated_stats": new_gen_stats,
+        "phases": phases.records,
     }
-    write_text(state_path, json.dumps(state, indent=2, ensure_ascii=False) + "\n")
+    if state != prev_state:
+        write_text_atomic(state_path, json.dumps(state, indent=2, ensure_ascii=False) + "\n")
+    # Run reports differ between identical runs, so they are returned but never persisted.
+    state["scan_report"] = asdict(detected.scan)
+    state["phase_report"] = {"ran": phases.ran, "skipped": phases.skipped}
+    state["write_report"] = asdict(WRITE_STATS)
+    return state
 
-    write_text(
-        root / ".agent" / "skills_todo.md",
-        "# TODO after bootstrap\n\n" + ("\n".join(todo) if todo else "(no todo)") + "\n",
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    init = sub.add_parser("init")
+    add_init_arguments(init)
+
+    init_many = sub.add_parser("init-many", help="bootstrap many project roots with a single registry fetch")
+    init_many.add_argument("roots", nargs="*", help="project roots to bootstrap")
+    init_many.add_argument("--roots-file", default="", help="file with one project root per line ('-' for stdin)")
+    init_many.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=os.cpu_count() or 1,
+        help="number of projects bootstrapped in parallel (default: CPU count)",
     )
+    add_init_arguments(init_many)
+
+    cache = sub.add_parser("cache", help="manage the shared registry cache")
+    cache_sub = cache.add_subparsers(dest="cache_cmd", required=True)
+    gc = cache_sub.add_parser("gc", help="prune stale keep-refs, run git maintenance, drop unused mirrors")
+    gc.add_argument(
+        "--max-age-days",
+        type=positive_int,
+        default=DEFAULT_CACHE_MAX_AGE_DAYS,
+        help="remove mirrors not used for this many days (default: 30)",
+    )
+
+    verify = sub.add_parser("verify", help="check installed registry skills against their install manifest")
+    verify.add_argument("--json", action="store_true", help="emit the report as JSON")
+    verify.add_argument("--jobs", type=positive_int, default=None, help="hashing threads (default: Python's pool size)")
 
+    args = ap.parse_args()
+    if args.cmd == "verify":
+        return run_verify(repo_root(), args)
+    if args.cmd == "init-many":
+        return run_init_many(args)
+    if args.cmd == "cache":
+        print(json.dumps(cache_gc(args.max_age_days), indent=2, ensure_ascii=False))
+        return 0
+
+    state = run_init(repo_root(), args)
+    report = state.get("phase_report") or {"ran": [], "skipped": []}
     print("Bootstrap complete.")
+    if state.get("reused_concurrent_run"):
+        print("Reused the result of an identical bootstrap that finished while this one waited for the lock.")
+    print(f"Phases run: {', '.join(report['ran']) or '-'}")
+    print(f"Phases skipped (unchanged inputs): {', '.join(report['skipped']) or '-'}")
+    writes = state.get("write_report") or {}
+    print(f"Writes skipped (content unchanged): {writes.get('skipped', 0)} ({writes.get('written', 0)} written)")
+    scan = state.get("scan_report")
+    if scan:
+        print(f"Directories scanned: {scan['dirs_scanned']} (cached: {scan['dirs_cached']}, source: {scan['source']})")
     print("Next:")
     print("- Review .agent/skills_todo.md")
     print("- Restart Codex CLI to reload skills (recommended).")
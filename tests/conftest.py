@@ -1,6 +1,14 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 TESTS_DIR = Path(__file__).resolve().parent
 if str(TESTS_DIR) not in sys.path:
     sys.path.insert(0, str(TESTS_DIR))
+
+
+@pytest.fixture(autouse=True)
+def isolated_user_cache(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Keep mirrors, the skill store and compiled templates out of the real ~/.cache during tests.
+    monkeypatch.setenv("SKILLREGISTRY_CACHE_DIR", str(tmp_path_factory.mktemp("user-cache")))
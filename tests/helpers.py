@@ -121,3 +121,35 @@ def create_registry(
 
     init_git_repo(root)
     return commit_all(root, "init")
+
+
+FAKE_INSTALLER = """
+import argparse
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+p = argparse.ArgumentParser()
+p.add_argument("--repo")
+p.add_argument("--url")
+p.add_argument("--ref")
+p.add_argument("--path")
+p.add_argument("--dest")
+p.add_argument("--method")
+args = p.parse_args()
+time.sleep(float(os.environ.get("FAKE_INSTALLER_SLEEP", "0")))
+src = Path(os.environ["FAKE_REGISTRY"]) / args.path
+if not src.is_dir():
+    raise SystemExit(f"not found: {args.path}")
+shutil.copytree(src, Path(args.dest) / src.name)
+with open(os.environ["FAKE_INSTALLER_LOG"], "a", encoding="utf-8") as log:
+    log.write(json.dumps({"path": args.path, "ref": args.ref, "method": args.method}) + "\\n")
+"""
+
+
+def create_fake_skill_installer(codex_home: Path) -> None:
+    """Stand-in for the system skill-installer: copies `$FAKE_REGISTRY/<path>` and logs each call."""
+    scripts = codex_home / "skills" / ".system" / "skill-installer" / "scripts"
+    write_text(scripts / "install-skill-from-github.py", FAKE_INSTALLER)
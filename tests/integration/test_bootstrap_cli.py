@@ -1,26 +1,27 @@
 import json
+import os
+import shutil
 import subprocess
 import sys
+import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 
 from helpers import (
     bootstrap_path,
     commit_all,
+    create_fake_skill_installer,
     create_registry,
     init_git_repo,
     load_bootstrap_module,
+    repo_root,
+    run,
     write_json,
     write_text,
 )
 
 
-def run_bootstrap(
-    project_root: Path,
-    registry_root: Path,
-    ref: str,
-    extra_args: Optional[List[str]] = None,
-) -> subprocess.CompletedProcess:
+def bootstrap_cmd(registry_root: Union[Path, str], ref: str, extra_args: Optional[List[str]] = None) -> List[str]:
     cmd = [
         sys.executable,
         str(bootstrap_path()),
@@ -34,15 +35,34 @@ def run_bootstrap(
     ]
     if extra_args:
         cmd.extend(extra_args)
+    return cmd
+
+
+def run_bootstrap(
+    project_root: Path,
+    registry_root: Union[Path, str],
+    ref: str,
+    extra_args: Optional[List[str]] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> subprocess.CompletedProcess:
     return subprocess.run(
-        cmd,
+        bootstrap_cmd(registry_root, ref, extra_args),
         cwd=str(project_root),
+        env=env,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
     )
 
 
+def printed_phases(stdout: str) -> Dict[str, List[str]]:
+    lines = dict(line.split(": ", 1) for line in stdout.splitlines() if line.startswith("Phases "))
+    return {
+        key: [] if value == "-" else value.split(", ")
+        for key, value in (("ran", lines["Phases run"]), ("skipped", lines["Phases skipped (unchanged inputs)"]))
+    }
+
+
 def test_bootstrap_empty_project_creates_basics(tmp_path: Path) -> None:
     registry = tmp_path / "registry"
     skillsets = {"baseline": ["base-a", "base-b"]}
@@ -381,3 +401,479 @@ def test_missing_template_fails(tmp_path: Path) -> None:
     result = run_bootstrap(project, registry, commit)
     assert result.returncode != 0
     assert "Template not found" in result.stderr
+
+
+def test_workspace_generates_per_package_workflows(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    skillsets = {"baseline": ["base-a"], "lang_go": ["lang-go"], "lang_python": ["lang-python"]}
+    commit = create_registry(registry, skillsets)
+
+    project = tmp_path / "project"
+    project.mkdir()
+    init_git_repo(project)
+    write_text(project / "services" / "billing" / "go.mod", "module billing\n")
+    write_text(project / "tools" / "gen" / "pyproject.toml", "[project]\nname = 'gen'\n")
+    module = load_bootstrap_module()
+    prefix = module.infer_project_prefix(project)
+
+    result = run_bootstrap(project, registry, commit, ["--workspace"])
+    assert result.returncode == 0, result.stderr
+
+    skills = project / ".codex" / "skills"
+    assert (skills / "lang-go" / "SKILL.md").is_file()
+    assert (skills / "lang-python" / "SKILL.md").is_file()
+    assert (skills / f"{prefix}-project-workflow" / "SKILL.md").is_file()
+    billing = skills / f"{prefix}-project-workflow-services-billing" / "SKILL.md"
+    assert "cd services/billing && go test ./..." in billing.read_text(encoding="utf-8")
+    assert (skills / f"{prefix}-project-workflow-tools-gen" / "SKILL.md").is_file()
+
+    state = json.loads((project / ".agent" / "skills_state.json").read_text(encoding="utf-8"))
+    assert state["workspace_packages"] == ["services/billing", "tools/gen"]
+    profile = json.loads((project / ".agent" / "project_profile.json").read_text(encoding="utf-8"))
+    assert profile["packages"]["services/billing"]["languages"] == ["go"]
+
+
+def test_init_many_fetches_registry_once(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    commit = create_registry(registry, {"baseline": ["base-a"]})
+
+    roots = []
+    for name in ("svc-one", "svc-two"):
+        project = tmp_path / name
+        project.mkdir()
+        init_git_repo(project)
+        roots.append(project)
+    missing = tmp_path / "missing"
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            str(bootstrap_path()),
+            "init-many",
+            *[str(r) for r in roots],
+            str(missing),
+            "--jobs",
+            "2",
+            "--skillregistry-git",
+            str(registry),
+            "--skillregistry-ref",
+            commit,
+            "--install-method",
+            "local",
+        ],
+        cwd=str(tmp_path),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert result.returncode == 1, result.stderr
+
+    summary = json.loads(result.stdout)
+    assert summary["skillregistry"]["commit"] == commit
+    assert summary["ok"] == 2
+    assert summary["failed"] == 1
+    assert [r["status"] for r in summary["results"]] == ["ok", "ok", "failed"]
+    assert "Project root not found" in summary["results"][2]["error"]
+    for project in roots:
+        assert (project / ".codex" / "skills" / "base-a" / "SKILL.md").is_file()
+        sr = project / ".agent" / "skillregistry"
+        assert run(["git", "remote", "get-url", "origin"], cwd=sr) == str(registry)
+        state = json.loads((project / ".agent" / "skills_state.json").read_text(encoding="utf-8"))
+        assert state["skillregistry"]["commit"] == commit
+
+
+def test_registry_mirror_shared_by_projects_and_gc(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    commit = create_registry(registry, {"baseline": ["base-a"]})
+    cache_dir = tmp_path / "cache"
+    env = dict(os.environ, SKILLREGISTRY_CACHE_DIR=str(cache_dir))
+
+    projects = []
+    for name in ("one", "two"):
+        project = tmp_path / name
+        project.mkdir()
+        init_git_repo(project)
+        result = run_bootstrap(project, registry, commit, ["--registry-mirror"], env=env)
+        assert result.returncode == 0, result.stderr
+        alternates = project / ".agent" / "skillregistry" / ".git" / "objects" / "info" / "alternates"
+        assert alternates.is_file()
+        projects.append(project)
+
+    mirrors = list(cache_dir.glob("*.git"))
+    assert len(mirrors) == 1
+    usage = json.loads((mirrors[0] / "bootstrap-usage.json").read_text(encoding="utf-8"))
+    assert len(usage["borrowers"]) == 2
+
+    gc = subprocess.run(
+        [sys.executable, str(bootstrap_path()), "cache", "gc"],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert gc.returncode == 0, gc.stderr
+    report = json.loads(gc.stdout)["mirrors"][0]
+    assert report["action"] == "gc"
+    assert report["kept_commits"] == [commit]
+    assert run(["git", "rev-parse", f"refs/bootstrap/keep/{commit}"], cwd=mirrors[0]) == commit
+
+    usage["last_used"] = int(time.time()) - 90 * 86400
+    write_json(mirrors[0] / "bootstrap-usage.json", usage)
+    gc = subprocess.run(
+        [sys.executable, str(bootstrap_path()), "cache", "gc", "--max-age-days", "30"],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert gc.returncode == 0, gc.stderr
+    assert json.loads(gc.stdout)["mirrors"][0]["action"] == "removed"
+    assert not mirrors[0].exists()
+    for project in projects:
+        sr = project / ".agent" / "skillregistry"
+        assert not (sr / ".git" / "objects" / "info" / "alternates").exists()
+        assert run(["git", "cat-file", "-t", "HEAD"], cwd=sr) == "commit"
+
+
+def test_pinned_sha_rerun_needs_no_remote(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    commit = create_registry(registry, {"baseline": ["base-a"]})
+
+    project = tmp_path / "project"
+    project.mkdir()
+    init_git_repo(project)
+
+    first = run_bootstrap(project, registry, commit)
+    assert first.returncode == 0, first.stderr
+
+    offline = tmp_path / "registry-offline"
+    registry.rename(offline)
+    second = run_bootstrap(project, registry, commit)
+    assert second.returncode == 0, second.stderr
+    state = json.loads((project / ".agent" / "skills_state.json").read_text(encoding="utf-8"))
+    assert state["skillregistry"]["commit"] == commit
+
+
+def test_branch_ref_fetches_latest_commit(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    create_registry(registry, {"baseline": ["base-a"]})
+    branch = run(["git", "rev-parse", "--abbrev-ref", "HEAD"], cwd=registry)
+
+    project = tmp_path / "project"
+    project.mkdir()
+    init_git_repo(project)
+
+    first = run_bootstrap(project, registry, branch)
+    assert first.returncode == 0, first.stderr
+
+    write_json(registry / "catalog" / "skillsets.json", {"baseline": ["base-a", "base-b"]})
+    write_text(registry / "skills" / "base-b" / "SKILL.md", "---\nname: base-b\ndescription: test\n---\n")
+    commit2 = commit_all(registry, "add base-b")
+
+    second = run_bootstrap(project, registry, branch)
+    assert second.returncode == 0, second.stderr
+    state = json.loads((project / ".agent" / "skills_state.json").read_text(encoding="utf-8"))
+    assert state["skillregistry"]["commit"] == commit2
+    assert (project / ".codex" / "skills" / "base-b" / "SKILL.md").is_file()
+
+
+def test_registry_clone_is_shallow_and_sparse(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    skillsets = {"baseline": ["base-a"], "lang_go": ["lang-go"]}
+    create_registry(registry, skillsets)
+    write_text(registry / "catalog" / "notes.md", "catalog notes\n")
+    commit_all(registry, "second")
+    write_json(registry / "catalog" / "skillsets.json", {"baseline": ["base-a", "base-b"], "lang_go": ["lang-go"]})
+    write_text(registry / "skills" / "base-b" / "SKILL.md", "---\nname: base-b\ndescription: test\n---\n")
+    commit3 = commit_all(registry, "third")
+
+    project = tmp_path / "project"
+    project.mkdir()
+    init_git_repo(project)
+    url = registry.resolve().as_uri()
+
+    result = run_bootstrap(project, url, commit3)
+    assert result.returncode == 0, result.stderr
+
+    sr = project / ".agent" / "skillregistry"
+    assert (sr / ".git" / "shallow").is_file()
+    assert run(["git", "rev-list", "--count", "HEAD"], cwd=sr) == "1"
+    assert sorted(p.name for p in (sr / "skills").iterdir()) == ["base-a", "base-b"]
+    assert (sr / "catalog" / "skillsets.json").is_file()
+    assert (project / ".codex" / "skills" / "base-b" / "SKILL.md").is_file()
+
+
+def test_registry_read_from_objects_without_checkout(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    commit1 = create_registry(registry, {"baseline": ["base-a"]})
+    run(["git", "config", "uploadpack.allowFilter", "true"], cwd=registry)
+    write_json(registry / "catalog" / "skillsets.json", {"baseline": ["base-a", "base-b"]})
+    write_text(registry / "skills" / "base-b" / "SKILL.md", "---\nname: base-b\ndescription: test\n---\n")
+    commit2 = commit_all(registry, "add base-b")
+
+    url = registry.resolve().as_uri()
+    extra = ["--registry-read", "objects"]
+    project = tmp_path / "first"
+    project.mkdir()
+    init_git_repo(project)
+    trace = tmp_path / "git-trace.log"
+    first = run_bootstrap(project, url, commit2, extra_args=extra, env=dict(os.environ, GIT_TRACE=str(trace)))
+    assert first.returncode == 0, first.stderr
+    # The clone, then one backfill for the core dirs and one for the selected skills; never one fetch per blob.
+    fetches = [line for line in trace.read_text(encoding="utf-8").splitlines() if "built-in: git upload-pack" in line]
+    assert len(fetches) == 3
+
+    sr = project / ".agent" / "skillregistry"
+    assert not (sr / "catalog").exists()
+    assert not (sr / "skills").exists()
+    assert (project / ".codex" / "skills" / "base-b" / "SKILL.md").is_file()
+    prefix = load_bootstrap_module().infer_project_prefix(project)
+    workflow = project / ".codex" / "skills" / f"{prefix}-project-workflow" / "SKILL.md"
+    assert "Build: " in workflow.read_text(encoding="utf-8")
+
+    # An older ref is served from the same clone without touching HEAD.
+    head_before = (sr / ".git" / "HEAD").read_text(encoding="utf-8")
+    second = run_bootstrap(project, url, commit1, extra_args=extra)
+    assert second.returncode == 0, second.stderr
+    assert (sr / ".git" / "HEAD").read_text(encoding="utf-8") == head_before
+    state = json.loads((project / ".agent" / "skills_state.json").read_text(encoding="utf-8"))
+    assert state["skillregistry"]["commit"] == commit1
+    assert state["registry_skills_installed"] == ["base-a"]
+    assert not (project / ".codex" / "skills" / "base-b").exists()
+
+
+def test_store_install_shares_objects_across_projects(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    script = registry / "skills" / "base-a" / "scripts" / "run.sh"
+    write_text(script, "#!/bin/sh\necho hi\n")
+    script.chmod(0o755)
+    commit = create_registry(registry, {"baseline": ["base-a", "base-b"]})
+    cache_dir = tmp_path / "cache"
+    env = dict(os.environ, SKILLREGISTRY_CACHE_DIR=str(cache_dir))
+
+    for name in ("one", "two"):
+        project = tmp_path / name
+        project.mkdir()
+        init_git_repo(project)
+        result = run_bootstrap(project, registry, commit, ["--install-method", "store"], env=env)
+        assert result.returncode == 0, result.stderr
+        skill = project / ".codex" / "skills" / "base-a"
+        assert (skill / "SKILL.md").read_text(encoding="utf-8").startswith("---\nname: base-a\n")
+        assert os.access(skill / "scripts" / "run.sh", os.X_OK)
+
+    # base-a/SKILL.md, base-b/SKILL.md and run.sh: one store object each, shared by both projects.
+    objects = sorted(p.name for p in (cache_dir / "store" / "objects").glob("*/*"))
+    assert len(objects) == 3
+    assert sum(name.endswith("-x") for name in objects) == 1
+
+    gc = subprocess.run(
+        [sys.executable, str(bootstrap_path()), "cache", "gc"],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert gc.returncode == 0, gc.stderr
+    assert json.loads(gc.stdout)["store"]["kept"] == 3
+
+
+def test_verify_reports_drift_against_install_manifest(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    write_text(registry / "skills" / "base-a" / "references" / "notes.md", "notes\n")
+    commit = create_registry(registry, {"baseline": ["base-a", "base-b"]})
+
+    project = tmp_path / "project"
+    project.mkdir()
+    init_git_repo(project)
+    result = run_bootstrap(project, registry, commit)
+    assert result.returncode == 0, result.stderr
+
+    state = json.loads((project / ".agent" / "skills_state.json").read_text(encoding="utf-8"))
+    assert sorted(state["registry_skill_manifests"]["codex/base-a"]) == ["SKILL.md", "references/notes.md"]
+
+    def verify() -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, str(bootstrap_path()), "verify", "--json"],
+            cwd=str(project),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+
+    clean = verify()
+    assert clean.returncode == 0, clean.stderr
+    report = json.loads(clean.stdout)
+    assert report["ok"] is True
+    assert report["files_checked"] == 3
+    assert report["files_hashed"] == 0
+
+    skills = project / ".codex" / "skills"
+    write_text(skills / "base-a" / "SKILL.md", "---\nname: base-a\ndescription: edited\n---\n")
+    (skills / "base-a" / "references" / "notes.md").unlink()
+    write_text(skills / "base-b" / "extra.md", "extra\n")
+    write_text(skills / "base-b" / "__pycache__" / "x.pyc", "junk")
+
+    drift = verify()
+    assert drift.returncode == 1
+    report = json.loads(drift.stdout)
+    assert report["modified"] == ["codex/base-a/SKILL.md"]
+    assert report["missing"] == ["codex/base-a/references/notes.md"]
+    assert report["extra"] == ["codex/base-b/extra.md"]
+
+
+def test_unchanged_rerun_skips_phases(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    commit = create_registry(registry, {"baseline": ["base-a"], "lang_python": ["lang-python"]})
+
+    project = tmp_path / "project"
+    project.mkdir()
+    init_git_repo(project)
+    (project / "pyproject.toml").write_text("[project]\nname = 'demo'\n", encoding="utf-8")
+    (project / ".env.example").write_text("STRIPE_API_KEY=abc\n", encoding="utf-8")
+    state_path = project / ".agent" / "skills_state.json"
+
+    def phase_report() -> Dict[str, List[str]]:
+        result = run_bootstrap(project, registry, commit)
+        assert result.returncode == 0, result.stderr
+        return printed_phases(result.stdout)
+
+    first = phase_report()
+    assert first["skipped"] == []
+    assert phase_report() == {"ran": ["detect"], "skipped": ["registry", "clean", "install", "workflow", "api", "write"]}
+    state_mtime = state_path.stat().st_mtime_ns
+    assert phase_report()["ran"] == ["detect"]
+    assert state_path.stat().st_mtime_ns == state_mtime
+    todo = (project / ".agent" / "skills_todo.md").read_text(encoding="utf-8")
+    assert "API skill overlay ensured" in todo
+
+    write_text(project / ".codex" / "skills" / "base-a" / "SKILL.md", "---\nname: base-a\ndescription: edited\n---\n")
+    rerun = phase_report()
+    assert "install" in rerun["ran"]
+    assert "workflow" in rerun["skipped"]
+
+
+def test_profile_is_stable_across_identical_runs(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    commit = create_registry(registry, {"baseline": ["base-a"]})
+
+    project = tmp_path / "project"
+    project.mkdir()
+    init_git_repo(project)
+    (project / "pyproject.toml").write_text("[project]\nname = 'demo'\n", encoding="utf-8")
+    profile_path = project / ".agent" / "project_profile.json"
+
+    result = run_bootstrap(project, registry, commit)
+    assert result.returncode == 0, result.stderr
+    profile = profile_path.read_text(encoding="utf-8")
+    assert set(json.loads(profile)["scan"]) == {"source", "pruned_dirs"}
+
+    result = run_bootstrap(project, registry, commit)
+    assert result.returncode == 0, result.stderr
+    assert profile_path.read_text(encoding="utf-8") == profile
+    assert "Directories scanned:" in result.stdout
+
+
+def test_deleted_kept_skill_is_reinstalled_on_rerun(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    commit = create_registry(registry, {"baseline": ["base-a", "base-b"]})
+
+    project = tmp_path / "project"
+    project.mkdir()
+    init_git_repo(project)
+    kept = project / ".codex" / "skills" / "base-a"
+    write_text(kept / "SKILL.md", "---\nname: base-a\ndescription: hand made\n---\n")
+
+    result = run_bootstrap(project, registry, commit)
+    assert result.returncode == 0, result.stderr
+    assert "base-a` already exists" in (project / ".agent" / "skills_todo.md").read_text(encoding="utf-8")
+
+    shutil.rmtree(kept)
+    result = run_bootstrap(project, registry, commit)
+    assert result.returncode == 0, result.stderr
+    assert "install" in printed_phases(result.stdout)["ran"]
+    assert "hand made" not in (kept / "SKILL.md").read_text(encoding="utf-8")
+    assert "base-a` already exists" not in (project / ".agent" / "skills_todo.md").read_text(encoding="utf-8")
+
+
+def test_skill_installer_method_runs_helper_in_process(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    helper = repo_root() / "scripts" / "install_registry_skills.py"
+    write_text(registry / "scripts" / "install_registry_skills.py", helper.read_text(encoding="utf-8"))
+    commit = create_registry(registry, {"baseline": ["base-a", "base-b"]})
+
+    codex_home = tmp_path / "codex"
+    create_fake_skill_installer(codex_home)
+    log = tmp_path / "installer.log"
+    env = dict(os.environ, CODEX_HOME=str(codex_home), FAKE_REGISTRY=str(registry), FAKE_INSTALLER_LOG=str(log))
+
+    project = tmp_path / "project"
+    project.mkdir()
+    init_git_repo(project)
+    result = run_bootstrap(project, registry, commit, ["--install-method", "skill-installer"], env=env)
+    assert result.returncode == 0, result.stderr
+
+    state = json.loads((project / ".agent" / "skills_state.json").read_text(encoding="utf-8"))
+    assert state["registry_skills_installed"] == ["base-a", "base-b"]
+    assert (project / ".codex" / "skills" / "base-b" / "SKILL.md").is_file()
+    calls = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+    assert sorted(c["path"] for c in calls) == ["skills/base-a", "skills/base-b"]
+    assert {c["ref"] for c in calls} == {commit}
+
+
+def test_concurrent_inits_serialize_on_project_lock(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    commit = create_registry(registry, {"baseline": ["base-a", "base-b"], "lang_python": ["lang-python"]})
+
+    project = tmp_path / "project"
+    project.mkdir()
+    init_git_repo(project)
+    (project / "pyproject.toml").write_text("[project]\nname = 'demo'\n", encoding="utf-8")
+
+    procs = [
+        subprocess.Popen(
+            bootstrap_cmd(registry, commit),
+            cwd=str(project),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(4)
+    ]
+    outputs = [p.communicate(timeout=120) for p in procs]
+    for proc, (stdout, stderr) in zip(procs, outputs):
+        assert proc.returncode == 0, stderr
+        assert "Bootstrap complete." in stdout
+
+    state = json.loads((project / ".agent" / "skills_state.json").read_text(encoding="utf-8"))
+    assert state["registry_skills_installed"] == ["base-a", "base-b", "lang-python"]
+    skills = sorted(p.name for p in (project / ".codex" / "skills").iterdir())
+    assert [name for name in skills if name.startswith(".")] == []
+    assert not (project / ".agent" / "txn").exists()
+    lock_record = json.loads((project / ".agent" / "bootstrap.lock").read_text(encoding="utf-8"))
+    assert set(lock_record) == {"key", "started_ns", "finished_ns", "pid"}
+
+
+def test_rerun_skips_writes_of_unchanged_content(tmp_path: Path) -> None:
+    registry = tmp_path / "registry"
+    commit = create_registry(registry, {"baseline": ["base-a"], "lang_python": ["lang-python"]})
+
+    project = tmp_path / "project"
+    project.mkdir()
+    init_git_repo(project)
+    (project / "pyproject.toml").write_text("[project]\nname = 'demo'\n", encoding="utf-8")
+    (project / ".env.example").write_text("STRIPE_API_KEY=abc\n", encoding="utf-8")
+    result = run_bootstrap(project, registry, commit)
+    assert result.returncode == 0, result.stderr
+
+    skills = project / ".codex" / "skills"
+    overlays = sorted(skills.glob("*/SKILL.md"))
+    watched = overlays + [project / ".agent" / "skills_todo.md"]
+    before = {p: p.stat().st_mtime_ns for p in watched}
+
+    # Forcing overlay overwrites re-runs the overlay phases; identical content must still not be rewritten.
+    result = run_bootstrap(project, registry, commit, ["--force-overwrite-overlays"])
+    assert result.returncode == 0, result.stderr
+    assert {p: p.stat().st_mtime_ns for p in watched} == before
+    assert list(skills.glob("*/SKILL.md.bootstrap.bak")) == []
+    # Both overlays are regenerated with identical content; the profile and TODO phase is skipped outright.
+    assert "Writes skipped (content unchanged): 2 (0 written)" in result.stdout
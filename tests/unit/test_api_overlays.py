@@ -0,0 +1,53 @@
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from helpers import create_registry, load_bootstrap_module, write_text
+
+
+def generate(module: Any, registry_root: Path, project: Path, apis: List[str]) -> Tuple[List[str], Dict[str, str]]:
+    detected = module.Detected(languages=[], has_docker=False, has_github_actions=False, apis=apis, openapi_files=[])
+    todo: List[str] = []
+    hashes: Dict[str, str] = {}
+    with module.RegistryReader(registry_root) as registry:
+        module.generate_api_skeletons(
+            registry=registry,
+            project_root=project,
+            targets=["codex"],
+            detected=detected,
+            todo=todo,
+            prev_generated_hashes={},
+            new_generated_hashes=hashes,
+            force_overwrite=False,
+            adopt_existing=False,
+            project_prefix="demo",
+            force_create_overlays=False,
+            prefix_changed=False,
+            prev_prefix=None,
+            overlays_skipped=[],
+        )
+    return [line.replace(str(project), "<project>") for line in todo], hashes
+
+
+def test_parallel_api_overlays_match_serial_order(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    module = load_bootstrap_module()
+    registry_root = tmp_path / "registry"
+    create_registry(registry_root, {"baseline": []})
+    apis = [f"svc{i:03d}" for i in range(200)] + ["svc007", "svc050"]
+
+    results = []
+    for jobs in (1, 16):
+        monkeypatch.setattr(module, "OVERLAY_WRITE_JOBS", jobs)
+        project = tmp_path / f"project-{jobs}"
+        # An overlay without generation history is left alone and reported from inside its write job.
+        write_text(project / ".codex" / "skills" / "demo-api-svc100" / "SKILL.md", "hand written\n")
+        results.append(generate(module, registry_root, project, apis))
+
+    serial, parallel = results
+    assert parallel[0] == serial[0]
+    assert list(parallel[1].items()) == list(serial[1].items())
+    assert list(serial[1]) == [f"codex/demo-api-svc{i:03d}" for i in range(200) if i != 100]
+    assert sum("API skill overlay ensured" in line for line in serial[0]) == 200
+    assert any("demo-api-svc100` exists but has no generation history" in line for line in serial[0])
+    assert (tmp_path / "project-16" / ".codex" / "skills" / "demo-api-svc199" / "references" / "TODO.md").is_file()
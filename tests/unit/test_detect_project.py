@@ -1,6 +1,8 @@
+import os
+import time
 from pathlib import Path
 
-from helpers import load_bootstrap_module
+from helpers import commit_all, init_git_repo, load_bootstrap_module
 
 
 def test_detect_project_languages_flags_and_apis(tmp_path: Path) -> None:
@@ -26,3 +28,196 @@ def test_detect_project_languages_flags_and_apis(tmp_path: Path) -> None:
     assert "stripe" in detected.apis
     assert "foo_bar" in detected.apis
     assert set(detected.openapi_files) == {"openapi.yaml"}
+
+
+def test_detect_project_prunes_builtin_and_ignored_dirs(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+
+    (tmp_path / ".gitignore").write_text("build/\n/generated\n*.tmp.yaml\n!keep/\n", encoding="utf-8")
+    (tmp_path / ".git" / "info").mkdir(parents=True)
+    (tmp_path / ".git" / "info" / "exclude").write_text("scratch\n", encoding="utf-8")
+    for rel in [
+        "api/openapi.yaml",
+        "services/billing/swagger.json",
+        "node_modules/pkg/openapi.json",
+        ".agent/skillregistry/openapi.yaml",
+        ".agent/overlays_pending/openapi.yaml",
+        "build/openapi.yaml",
+        "generated/openapi.yaml",
+        "docs/generated/openapi.yml",
+        "scratch/swagger.yml",
+        "target/openapi.yaml",
+    ]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("openapi: 3.0.0\n", encoding="utf-8")
+
+    detected = module.detect_project(tmp_path)
+
+    assert detected.openapi_files == [
+        "api/openapi.yaml",
+        "docs/generated/openapi.yml",
+        "services/billing/swagger.json",
+    ]
+    # .git, node_modules, .agent, build, generated, scratch, target
+    assert detected.scan.pruned_dirs == 7
+
+
+def test_gitignore_rules_follow_last_match() -> None:
+    module = load_bootstrap_module()
+    rules = module.parse_ignore_lines(["*.yaml", "!openapi.yaml", "docs/**/tmp", "# comment", ""])
+
+    assert module.is_ignored(rules, "a/b.yaml", False) is True
+    assert module.is_ignored(rules, "a/openapi.yaml", False) is False
+    assert module.is_ignored(rules, "docs/x/y/tmp", True) is True
+    assert module.is_ignored(rules, "docs/tmp", True) is True
+    assert module.is_ignored(rules, "src/docs/tmp", True) is False
+
+
+def test_nested_gitignore_applies_to_its_subtree(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    for rel in [
+        "services/api/openapi.yaml",
+        "services/api/generated/openapi.yaml",
+        "services/web/fixtures/swagger.json",
+        "services/web/generated/openapi.yaml",
+    ]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("openapi: 3.0.0\n", encoding="utf-8")
+    # Patterns are relative to the directory holding the .gitignore.
+    (tmp_path / "services" / "api" / ".gitignore").write_text("/generated/\n", encoding="utf-8")
+    (tmp_path / "services" / "web" / ".gitignore").write_text("*.json\n", encoding="utf-8")
+
+    for workers in (1, 4):
+        detected = module.detect_project(tmp_path, scan_workers=workers)
+        assert detected.openapi_files == ["services/api/openapi.yaml", "services/web/generated/openapi.yaml"]
+        assert detected.scan.pruned_dirs == 1
+
+
+def age_tree(root: Path, seconds: int = 3600) -> None:
+    past = time.time() - seconds
+    for path in [root, *root.rglob("*")]:
+        os.utime(path, (past, past), follow_symlinks=False)
+
+
+def test_detect_cache_rescans_only_changed_dirs(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    cache = tmp_path / ".agent" / "detect_cache.json"
+
+    (tmp_path / "pyproject.toml").write_text("[project]\nname = 'x'\n", encoding="utf-8")
+    (tmp_path / ".env.example").write_text("STRIPE_API_KEY=abc\n", encoding="utf-8")
+    for rel in [".agent", "a/one", "a/two", "b"]:
+        (tmp_path / rel).mkdir(parents=True)
+    (tmp_path / "a" / "one" / "openapi.yaml").write_text("openapi: 3.0.0\n", encoding="utf-8")
+    age_tree(tmp_path)
+
+    first = module.detect_project(tmp_path, cache_path=cache)
+    assert cache.is_file()
+    assert first.openapi_files == ["a/one/openapi.yaml"]
+
+    second = module.detect_project(tmp_path, cache_path=cache)
+    assert second.scan.dirs_scanned == 0
+    assert second.scan.dirs_cached == first.scan.dirs_scanned
+    assert second.languages == ["python"]
+    assert second.apis == ["stripe"]
+    assert second.openapi_files == first.openapi_files
+
+    (tmp_path / "b" / "swagger.json").write_text("{}\n", encoding="utf-8")
+    third = module.detect_project(tmp_path, cache_path=cache)
+    assert third.scan.dirs_scanned == 1
+    assert third.openapi_files == ["a/one/openapi.yaml", "b/swagger.json"]
+
+
+def test_detect_cache_invalidated_by_gitignore_change(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    cache = tmp_path / ".agent" / "detect_cache.json"
+    (tmp_path / "gen").mkdir()
+    (tmp_path / "gen" / "openapi.yaml").write_text("openapi: 3.0.0\n", encoding="utf-8")
+    age_tree(tmp_path)
+
+    assert module.detect_project(tmp_path, cache_path=cache).openapi_files == ["gen/openapi.yaml"]
+
+    (tmp_path / ".gitignore").write_text("gen/\n", encoding="utf-8")
+    detected = module.detect_project(tmp_path, cache_path=cache)
+    assert detected.openapi_files == []
+    assert detected.scan.dirs_cached == 0
+
+
+def test_detect_cache_invalidated_by_nested_gitignore_edit(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    cache = tmp_path / ".agent" / "detect_cache.json"
+    (tmp_path / ".agent").mkdir()
+    (tmp_path / "svc" / "gen").mkdir(parents=True)
+    (tmp_path / "svc" / "gen" / "openapi.yaml").write_text("openapi: 3.0.0\n", encoding="utf-8")
+    ignore = tmp_path / "svc" / ".gitignore"
+    ignore.write_text("tmp/\n", encoding="utf-8")
+    age_tree(tmp_path)
+
+    assert module.detect_project(tmp_path, cache_path=cache).openapi_files == ["svc/gen/openapi.yaml"]
+
+    # Rewriting the file in place does not touch its directory's mtime.
+    svc_mtime = os.stat(tmp_path / "svc").st_mtime_ns
+    ignore.write_text("gen/\n", encoding="utf-8")
+    assert os.stat(tmp_path / "svc").st_mtime_ns == svc_mtime
+    detected = module.detect_project(tmp_path, cache_path=cache)
+    assert detected.openapi_files == []
+    assert detected.scan.dirs_scanned == 1
+
+
+def test_parallel_scan_matches_serial(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    (tmp_path / ".gitignore").write_text("ignored/\n", encoding="utf-8")
+    for i in range(6):
+        for j in range(4):
+            d = tmp_path / f"svc{i}" / f"mod{j}"
+            d.mkdir(parents=True)
+            if (i + j) % 3 == 0:
+                (d / "openapi.yaml").write_text("openapi: 3.0.0\n", encoding="utf-8")
+    (tmp_path / "ignored").mkdir()
+    (tmp_path / "ignored" / "swagger.json").write_text("{}\n", encoding="utf-8")
+    (tmp_path / "svc0" / "node_modules").mkdir()
+
+    serial = module.detect_project(tmp_path)
+    parallel = module.detect_project(tmp_path, scan_workers=4)
+
+    assert parallel == serial
+    assert parallel.openapi_files == sorted(parallel.openapi_files)
+    assert parallel.scan.pruned_dirs == 2
+
+
+def test_detect_project_from_git_index(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    init_git_repo(tmp_path)
+    (tmp_path / "go.mod").write_text("module example\n", encoding="utf-8")
+    (tmp_path / "api").mkdir()
+    (tmp_path / "api" / "openapi.yaml").write_text("openapi: 3.0.0\n", encoding="utf-8")
+    (tmp_path / "vendor" / "dep").mkdir(parents=True)
+    (tmp_path / "vendor" / "dep" / "swagger.json").write_text("{}\n", encoding="utf-8")
+    (tmp_path / ".github" / "workflows").mkdir(parents=True)
+    (tmp_path / ".github" / "workflows" / "ci.yml").write_text("on: push\n", encoding="utf-8")
+    commit_all(tmp_path, "init")
+
+    (tmp_path / "untracked").mkdir()
+    (tmp_path / "untracked" / "swagger.yaml").write_text("swagger: '2.0'\n", encoding="utf-8")
+    (tmp_path / "package.json").write_text("{}\n", encoding="utf-8")
+    (tmp_path / ".env").write_text("SENTRY_TOKEN=x\n", encoding="utf-8")
+
+    detected = module.detect_project(tmp_path, source="git-index")
+
+    assert detected.scan.source == "git-index"
+    assert detected.languages == ["go"]
+    assert detected.openapi_files == ["api/openapi.yaml"]
+    assert detected.has_github_actions is True
+    assert detected.apis == ["sentry"]
+    assert detected.scan.pruned_dirs == 1
+
+
+def test_detect_source_auto_falls_back_to_filesystem(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    (tmp_path / "openapi.json").write_text("{}\n", encoding="utf-8")
+
+    detected = module.detect_project(tmp_path, source="auto")
+
+    assert detected.scan.source == "filesystem"
+    assert detected.openapi_files == ["openapi.json"]
@@ -0,0 +1,217 @@
+import http.server
+import importlib.util
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from helpers import commit_all, create_fake_skill_installer, init_git_repo, load_bootstrap_module, repo_root, write_text
+
+
+def installer_path() -> Path:
+    return repo_root() / "scripts" / "install_registry_skills.py"
+
+
+def load_installer_module():
+    path = installer_path()
+    spec = importlib.util.spec_from_file_location("install_registry_skills", path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to import installer helper from {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def fake_installer(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    codex_home = tmp_path / "codex"
+    create_fake_skill_installer(codex_home)
+    registry = tmp_path / "registry"
+    for name in ("alpha", "beta"):
+        write_text(registry / "skills" / name / "SKILL.md", f"---\nname: {name}\n---\n")
+    log = tmp_path / "installer.log"
+    monkeypatch.setenv("CODEX_HOME", str(codex_home))
+    monkeypatch.setenv("FAKE_REGISTRY", str(registry))
+    monkeypatch.setenv("FAKE_INSTALLER_LOG", str(log))
+    return log
+
+
+def test_install_returns_structured_results(tmp_path: Path, fake_installer: Path) -> None:
+    module = load_installer_module()
+    dest = tmp_path / "dest"
+    write_text(dest / "beta" / "SKILL.md", "local\n")
+
+    items = module.build_items(["alpha", "beta", "missing", "alpha"], [])
+    result = module.install(items, dest, ref="v1")
+
+    assert result.installed == ["alpha"]
+    assert result.skipped == [
+        {"name": "beta", "reason": "destination exists"},
+        {"name": "alpha", "reason": "duplicate entry"},
+    ]
+    assert [entry["name"] for entry in result.failed] == ["missing"]
+    assert "not found: skills/missing" in result.failed[0]["reason"]
+    assert (dest / "alpha" / "SKILL.md").is_file()
+    calls = [json.loads(line) for line in fake_installer.read_text(encoding="utf-8").splitlines()]
+    assert calls == [{"path": "skills/alpha", "ref": "v1", "method": "auto"}]
+
+
+def test_install_without_skill_installer_raises(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    module = load_installer_module()
+    monkeypatch.setenv("CODEX_HOME", str(tmp_path / "nowhere"))
+    with pytest.raises(RuntimeError, match="skill-installer not found"):
+        module.install(module.build_items(["alpha"], []), tmp_path / "dest")
+
+
+def test_cli_keeps_json_summary(tmp_path: Path, fake_installer: Path) -> None:
+    path = installer_path()
+    result = subprocess.run(
+        [sys.executable, str(path), "--dest", str(tmp_path / "dest"), "--skill", "alpha", "beta", "--json"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    summary = json.loads(result.stdout)
+    assert sorted(summary.pop("durations")) == ["alpha", "beta"]
+    assert summary == {"installed": ["alpha", "beta"], "skipped": [], "failed": []}
+
+
+def test_install_runs_skills_concurrently_in_order(
+    tmp_path: Path, fake_installer: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    module = load_installer_module()
+    registry = Path(os.environ["FAKE_REGISTRY"])
+    names = [f"skill-{i}" for i in range(6)]
+    for name in names:
+        write_text(registry / "skills" / name / "SKILL.md", f"---\nname: {name}\n---\n")
+    monkeypatch.setenv("FAKE_INSTALLER_SLEEP", "0.4")
+
+    started = time.perf_counter()
+    result = module.install(module.build_items(names + ["missing"], []), tmp_path / "dest", jobs=6)
+    elapsed = time.perf_counter() - started
+
+    assert result.installed == names
+    assert [entry["name"] for entry in result.failed] == ["missing"]
+    assert sorted(result.durations) == sorted(names + ["missing"])
+    assert all(result.durations[name] >= 0.4 for name in names)
+    assert elapsed < sum(result.durations[name] for name in names) / 2
+
+
+@pytest.fixture
+def archive_server(tmp_path: Path):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        for name in ("alpha", "beta", "gamma"):
+            zf.writestr(f"skillregistry-v1/skills/{name}/SKILL.md", f"---\nname: {name}\n---\n")
+        script = zipfile.ZipInfo("skillregistry-v1/skills/alpha/scripts/run.sh")
+        script.external_attr = 0o755 << 16
+        zf.writestr(script, "#!/bin/sh\n")
+        zf.writestr("skillregistry-v1/README.md", "registry\n")
+    payload = archive.getvalue()
+    requests: List[str] = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            requests.append(self.path)
+            if self.path != "/t3chn/skillregistry/zip/v1":
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", requests
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_download_fetches_archive_once_for_all_skills(
+    tmp_path: Path, archive_server, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    base_url, requests = archive_server
+    monkeypatch.setenv("CODEX_HOME", str(tmp_path / "nowhere"))
+    module = load_installer_module()
+    dest = tmp_path / "dest"
+
+    items = module.build_items(["alpha", "beta", "gamma", "missing"], [])
+    result = module.install(items, dest, ref="v1", method="download", archive_base_url=base_url)
+
+    assert requests == ["/t3chn/skillregistry/zip/v1"]
+    assert result.installed == ["alpha", "beta", "gamma"]
+    assert result.failed == [{"name": "missing", "reason": "not found in archive: skills/missing"}]
+    assert (dest / "gamma" / "SKILL.md").read_text(encoding="utf-8") == "---\nname: gamma\n---\n"
+    assert os.access(dest / "alpha" / "scripts" / "run.sh", os.X_OK)
+    assert not (dest / "README.md").exists()
+
+    items = module.build_items(["delta"], [])
+    result = module.install(items, dest, ref="nope", method="download", archive_base_url=base_url)
+    assert [entry["name"] for entry in result.failed] == ["delta"]
+    assert "failed to download" in result.failed[0]["reason"]
+
+
+def test_bootstrap_installs_once_and_replicates_to_every_target(tmp_path: Path, fake_installer: Path) -> None:
+    bootstrap = load_bootstrap_module()
+    registry = Path(os.environ["FAKE_REGISTRY"])
+    write_text(registry / "scripts" / "install_registry_skills.py", installer_path().read_text(encoding="utf-8"))
+    init_git_repo(registry)
+    commit = commit_all(registry, "init")
+    project = tmp_path / "project"
+    write_text(project / ".claude" / "skills" / "beta" / "SKILL.md", "local\n")
+
+    todo: List[str] = []
+    with bootstrap.RegistryReader(registry) as reader:
+        installed, skipped = bootstrap.install_registry_skills(
+            reader, project, ["alpha", "beta"], ["codex", "claude"], todo, "skill-installer", False, commit
+        )
+
+    assert installed == ["alpha", "beta"]
+    assert skipped == [{"name": "beta", "reason": "destination exists for claude"}]
+    calls = [json.loads(line) for line in fake_installer.read_text(encoding="utf-8").splitlines()]
+    assert sorted(call["path"] for call in calls) == ["skills/alpha", "skills/beta"]
+    for target, name in (("codex", "alpha"), ("claude", "alpha"), ("codex", "beta")):
+        skill_md = project / f".{target}" / "skills" / name / "SKILL.md"
+        assert skill_md.read_text(encoding="utf-8") == f"---\nname: {name}\n---\n"
+    assert (project / ".claude" / "skills" / "beta" / "SKILL.md").read_text(encoding="utf-8") == "local\n"
+
+
+def test_bootstrap_downloads_one_archive_without_skill_installer(
+    tmp_path: Path, archive_server, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    base_url, requests = archive_server
+    monkeypatch.setenv("CODEX_HOME", str(tmp_path / "nowhere"))
+    monkeypatch.setenv("SKILLREGISTRY_ARCHIVE_URL", base_url)
+    bootstrap = load_bootstrap_module()
+    registry = tmp_path / "registry"
+    write_text(registry / "scripts" / "install_registry_skills.py", installer_path().read_text(encoding="utf-8"))
+    for name in ("alpha", "beta"):
+        write_text(registry / "skills" / name / "SKILL.md", f"---\nname: {name}\n---\n")
+    project = tmp_path / "project"
+
+    todo: List[str] = []
+    with bootstrap.RegistryReader(registry) as reader:
+        installed, skipped = bootstrap.install_registry_skills(
+            reader, project, ["alpha", "beta"], ["codex", "claude"], todo, "skill-installer", False, "v1"
+        )
+
+    assert requests == ["/t3chn/skillregistry/zip/v1"]
+    assert installed == ["alpha", "beta"]
+    assert skipped == []
+    assert (project / ".claude" / "skills" / "beta" / "SKILL.md").is_file()
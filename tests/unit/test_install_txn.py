@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from helpers import load_bootstrap_module, write_text
+
+
+def skill_dir(project: Path, name: str) -> Path:
+    return project / ".codex" / "skills" / name
+
+
+def leftovers(project: Path) -> list:
+    return sorted(p.name for p in (project / ".codex" / "skills").iterdir() if p.name.startswith("."))
+
+
+def test_txn_swaps_staged_dirs_on_commit(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    dst = skill_dir(tmp_path, "demo")
+    write_text(dst / "SKILL.md", "old\n")
+    write_text(dst / "stale.md", "stale\n")
+
+    with module.InstallTxn(tmp_path) as txn:
+        staging = txn.stage(dst)
+        write_text(staging / "SKILL.md", "new\n")
+        assert (dst / "SKILL.md").read_text(encoding="utf-8") == "old\n"
+        # Agents scan the skills dir; staged trees are kept out of it.
+        assert leftovers(tmp_path) == []
+        assert staging.is_relative_to(module.txn_dir(tmp_path))
+
+    assert sorted(p.name for p in dst.iterdir()) == ["SKILL.md"]
+    assert (dst / "SKILL.md").read_text(encoding="utf-8") == "new\n"
+    assert leftovers(tmp_path) == []
+    assert not module.txn_dir(tmp_path).exists()
+
+
+def test_txn_rolls_back_when_staging_fails(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    dst = skill_dir(tmp_path, "demo")
+    write_text(dst / "SKILL.md", "old\n")
+
+    with pytest.raises(RuntimeError):
+        with module.InstallTxn(tmp_path) as txn:
+            write_text(txn.stage(dst) / "SKILL.md", "half")
+            raise RuntimeError("download failed")
+
+    assert (dst / "SKILL.md").read_text(encoding="utf-8") == "old\n"
+    assert leftovers(tmp_path) == []
+    assert not module.txn_journal(tmp_path).exists()
+
+
+def test_recover_rolls_interrupted_runs_back_or_forward(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    journal = module.txn_journal(tmp_path)
+    dst = skill_dir(tmp_path, "demo")
+
+    rel = ".codex/skills/demo"
+
+    # Killed while staging: the old tree stays.
+    write_text(dst / "SKILL.md", "old\n")
+    write_text(module.txn_path(tmp_path, rel) / "SKILL.md", "half")
+    write_text(journal, json.dumps({"state": "prepare", "swaps": [".codex/skills/demo"]}))
+    assert module.recover_txn(tmp_path) == "back"
+    assert (dst / "SKILL.md").read_text(encoding="utf-8") == "old\n"
+    assert leftovers(tmp_path) == []
+
+    # Killed between the two renames of a committed swap: the new tree is moved into place.
+    module.txn_path(tmp_path, rel, "old").parent.mkdir(parents=True)
+    dst.rename(module.txn_path(tmp_path, rel, "old"))
+    write_text(module.txn_path(tmp_path, rel) / "SKILL.md", "new\n")
+    write_text(journal, json.dumps({"state": "commit", "swaps": [".codex/skills/demo"]}))
+    assert module.recover_txn(tmp_path) == "forward"
+    assert (dst / "SKILL.md").read_text(encoding="utf-8") == "new\n"
+    assert leftovers(tmp_path) == []
+    assert not module.txn_dir(tmp_path).exists()
+    assert module.recover_txn(tmp_path) is None
+
+    # Journals from the older layout (a `.agent/txn` file with dot-sibling staging dirs) are still honoured.
+    write_text(module.staging_sibling(dst) / "SKILL.md", "half")
+    write_text(module.txn_dir(tmp_path), json.dumps({"state": "prepare", "swaps": [rel]}))
+    assert module.recover_txn(tmp_path) == "back"
+    assert (dst / "SKILL.md").read_text(encoding="utf-8") == "new\n"
+    assert leftovers(tmp_path) == []
+    assert not module.txn_dir(tmp_path).exists()
@@ -0,0 +1,51 @@
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+
+from helpers import load_bootstrap_module
+
+
+def test_waiting_writer_reuses_only_runs_that_started_after_it(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    seen: Dict[str, bool] = {}
+    waiting = threading.Event()
+
+    def waiting_writer() -> None:
+        waiting.set()
+        with module.ProjectLock(tmp_path, exclusive=True) as lock:
+            seen["waited"] = lock.waited
+            seen["same"] = lock.started_while_waiting("same-args")
+            seen["other"] = lock.started_while_waiting("other-args")
+
+    # The holder started before the writer was invoked, so it may have missed changes made since.
+    with module.ProjectLock(tmp_path, exclusive=True) as first:
+        thread = threading.Thread(target=waiting_writer)
+        thread.start()
+        waiting.wait()
+        time.sleep(0.2)
+        first.record_run("same-args")
+    thread.join(timeout=10)
+    assert seen == {"waited": True, "same": False, "other": False}
+
+    # A run that took the lock after the writer started waiting has seen everything the writer would.
+    with module.ProjectLock(tmp_path, exclusive=True) as holder:
+        thread = threading.Thread(target=waiting_writer)
+        thread.start()
+        waiting.wait()
+        time.sleep(0.2)
+        assert thread.is_alive()
+        holder.acquired_ns = time.time_ns()
+        holder.record_run("same-args")
+    thread.join(timeout=10)
+    assert seen == {"waited": True, "same": True, "other": False}
+
+    with module.ProjectLock(tmp_path, exclusive=True) as later:
+        assert not later.started_while_waiting("same-args")
+
+
+def test_readers_share_the_lock(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    with module.ProjectLock(tmp_path, exclusive=False) as a:
+        with module.ProjectLock(tmp_path, exclusive=False) as b:
+            assert not a.waited and not b.waited
@@ -167,3 +167,61 @@ def test_safe_write_overlay_force_overwrite(tmp_path: Path) -> None:
     assert dst_file.read_text(encoding="utf-8") == "forced"
     assert new_gen["codex/project-workflow"] == module.sha256_file(dst_file)
     assert any("force-overwrite-overlays" in item for item in todo)
+
+
+def test_safe_write_overlay_trusts_unchanged_stat(tmp_path: Path, monkeypatch) -> None:
+    module = load_bootstrap_module()
+    key = "codex/project-workflow"
+    dst_file = tmp_path / ".codex" / "skills" / "project-workflow" / "SKILL.md"
+
+    def write(content: str, prev_gen, prev_stats):
+        new_gen, new_stats, todo = dict(prev_gen), dict(prev_stats), []
+        module.safe_write_overlay(
+            project_root=tmp_path,
+            target="codex",
+            overlay_name="project-workflow",
+            new_content=content,
+            prev_generated_hashes=prev_gen,
+            new_generated_hashes=new_gen,
+            todo=todo,
+            force=False,
+            adopt_existing=False,
+            prev_generated_stats=prev_stats,
+            new_generated_stats=new_stats,
+        )
+        return new_gen, new_stats, todo
+
+    gen, stats, _ = write("v1", {}, {})
+    assert gen[key] == module.sha256_bytes(b"v1")
+    assert stats[key] == module.stat_key(dst_file.stat())
+
+    def no_reads(p):
+        raise AssertionError(f"unexpected hash of {p}")
+
+    with monkeypatch.context() as m:
+        m.setattr(module, "sha256_file", no_reads)
+        gen, stats, _ = write("v2", gen, stats)
+    assert dst_file.read_text(encoding="utf-8") == "v2"
+
+    dst_file.write_text("edited", encoding="utf-8")
+    gen2, stats2, todo = write("v3", gen, stats)
+    assert dst_file.read_text(encoding="utf-8") == "edited"
+    assert gen2[key] == gen[key]
+    assert key not in stats2
+    assert any("was modified" in item for item in todo)
+
+
+def test_overlay_index_matches_name_and_dash_suffixes(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    root = tmp_path / ".codex" / "skills"
+    for name in ("api-stripe", "abc-api-stripe", "xapi-stripe", "abc-project-workflow"):
+        (root / name).mkdir(parents=True)
+    (root / "zz-api-stripe").write_text("not a dir", encoding="utf-8")
+
+    index = module.OverlayIndex(root)
+    assert index.similar("api-stripe") == ["abc-api-stripe", "api-stripe"]
+    assert index.similar("project-workflow") == ["abc-project-workflow"]
+    assert index.similar("stripe") == ["abc-api-stripe", "api-stripe", "xapi-stripe"]
+
+    index.add("new-api-stripe")
+    assert index.similar("api-stripe") == ["abc-api-stripe", "api-stripe", "new-api-stripe"]
@@ -0,0 +1,69 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from helpers import commit_all, init_git_repo, load_bootstrap_module, run, write_text
+
+
+def make_registry(root: Path) -> None:
+    write_text(root / "skills" / "demo" / "SKILL.md", "---\nname: demo\n---\n")
+    write_text(root / "skills" / "demo" / "references" / "a.md", "a\n")
+    write_text(root / "skills" / "demo" / "references" / "b.md", "b\n")
+    write_text(root / "skills" / "demo" / "scripts" / "old.py", "print('old')\n")
+    init_git_repo(root)
+    commit_all(root, "init")
+    write_text(root / "skills" / "demo" / "scripts" / "__pycache__" / "old.cpython-311.pyc", "junk")
+
+
+@pytest.mark.parametrize("mode", ["worktree", "objects"])
+def test_sync_tree_writes_only_changed_files(tmp_path: Path, mode: str) -> None:
+    module = load_bootstrap_module()
+    registry = tmp_path / "registry"
+    make_registry(registry)
+    dst = tmp_path / "dst" / "demo"
+
+    def sync():
+        commit = run(["git", "rev-parse", "HEAD"], cwd=registry) if mode == "objects" else None
+        with module.RegistryReader(registry, commit) as reader:
+            return module.sync_tree(reader, "skills/demo", dst)
+
+    first = sync()
+    assert (first.written, first.deleted, first.unchanged) == (4, 0, 0)
+    assert not (dst / "scripts" / "__pycache__").exists()
+
+    write_text(dst / "scripts" / "__pycache__" / "old.cpython-311.pyc", "local junk")
+    kept = os.stat(dst / "references" / "a.md")
+
+    write_text(registry / "skills" / "demo" / "references" / "b.md", "b changed\n")
+    (registry / "skills" / "demo" / "scripts" / "old.py").unlink()
+    commit_all(registry, "bump")
+
+    second = sync()
+    assert (second.written, second.deleted, second.unchanged) == (1, 1, 2)
+    assert (dst / "references" / "b.md").read_text(encoding="utf-8") == "b changed\n"
+    assert not (dst / "scripts" / "old.py").exists()
+    assert (dst / "scripts" / "__pycache__" / "old.cpython-311.pyc").is_file()
+    assert os.stat(dst / "references" / "a.md").st_ino == kept.st_ino
+    assert os.stat(dst / "references" / "a.md").st_mtime_ns == kept.st_mtime_ns
+
+    third = sync()
+    assert (third.written, third.deleted, third.unchanged) == (0, 0, 3)
+
+
+def test_same_as_worktree_leaves_hardlinked_mtime(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    src = tmp_path / "src.md"
+    write_text(src, "same\n")
+    store = tmp_path / "store.md"
+    write_text(store, "same\n")
+    os.utime(store, ns=(1, 1_000_000_000))
+    dst = tmp_path / "dst.md"
+    os.link(store, dst)
+
+    assert module.same_as_worktree(src, os.lstat(src), dst, os.lstat(dst))
+    assert os.stat(store).st_mtime_ns == 1_000_000_000
+
+    os.unlink(store)
+    assert module.same_as_worktree(src, os.lstat(src), dst, os.lstat(dst))
+    assert os.stat(dst).st_mtime_ns == os.stat(src).st_mtime_ns
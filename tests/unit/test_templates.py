@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from helpers import create_registry, load_bootstrap_module
+
+TEMPLATE = "api-skeleton.SKILL.template.md"
+
+
+def test_compiled_template_renders_in_one_pass() -> None:
+    module = load_bootstrap_module()
+    compiled = module.compile_template("a {{X}} b {{Y}} {{X}}{{Z}}")
+    assert compiled.placeholders == {"X", "Y", "Z"}
+    # Values are never re-scanned for placeholders, and missing ones stay visible.
+    assert compiled.render({"X": "{{Y}}", "Y": "y"}) == "a {{Y}} b y {{Y}}{{Z}}"
+
+
+def test_templates_are_cached_per_commit_and_report_placeholder_problems(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    module = load_bootstrap_module()
+    registry_root = tmp_path / "registry"
+    commit = create_registry(registry_root, {"baseline": []})
+
+    todo: List[str] = []
+    with module.RegistryReader(registry_root, head=commit) as registry:
+        first = module.render_template(registry, TEMPLATE, {"API_NAME": "stripe", "EXTRA": "x"}, todo)
+        module.render_template(registry, TEMPLATE, {"API_NAME": "github", "EXTRA": "x"}, todo)
+    assert "API: stripe" in first
+    assert todo == [f"- Template `{TEMPLATE}` does not use the variables: `EXTRA`"]
+    cache_mtime = module.template_cache_path(commit).stat().st_mtime_ns
+
+    # A fresh process at the same commit compiles nothing and reads no template from the registry.
+    module = load_bootstrap_module()
+    monkeypatch.setattr(module.RegistryReader, "read_text", lambda self, rel: pytest.fail(f"read {rel}"))
+    todo = []
+    with module.RegistryReader(registry_root, head=commit) as registry:
+        body = module.render_template(registry, TEMPLATE, {}, todo)
+    assert "API: {{API_NAME}}" in body
+    assert module.template_cache_path(commit).stat().st_mtime_ns == cache_mtime
+    assert todo == [f"- Template `{TEMPLATE}` has placeholders without a value (left as-is): `{{{{API_NAME}}}}`"]
+
+
+def test_write_text_atomic_uses_unique_temp_files(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    target = tmp_path / "shared.json"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: module.write_text_atomic(target, f"{i}\n" * 1000), range(64)))
+
+    assert len(set(target.read_text(encoding="utf-8").splitlines())) == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["shared.json"]
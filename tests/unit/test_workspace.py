@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from helpers import load_bootstrap_module, write_text
+
+
+def test_detect_workspace_finds_packages_in_one_walk(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+
+    write_text(tmp_path / "package.json", "{}\n")
+    write_text(tmp_path / "pnpm-lock.yaml", "lockfileVersion: 5.4\n")
+    write_text(tmp_path / "services" / "billing" / "go.mod", "module billing\n")
+    write_text(tmp_path / "services" / "billing" / "Makefile", "build:\n")
+    write_text(tmp_path / "services" / "billing" / ".env.example", "STRIPE_API_KEY=x\n")
+    write_text(tmp_path / "services" / "billing" / "api" / "openapi.yaml", "openapi: 3.0.0\n")
+    write_text(tmp_path / "web" / "package.json", "{}\n")
+    write_text(tmp_path / "tools" / "gen" / "pyproject.toml", "[project]\nname = 'gen'\n")
+    write_text(tmp_path / "docs" / "swagger.json", "{}\n")
+    write_text(tmp_path / "node_modules" / "dep" / "package.json", "{}\n")
+
+    workspace = module.detect_workspace(tmp_path)
+
+    assert sorted(workspace.packages) == ["services/billing", "tools/gen", "web"]
+    billing = workspace.packages["services/billing"]
+    assert billing.languages == ["go"]
+    assert billing.apis == ["stripe"]
+    assert billing.openapi_files == ["api/openapi.yaml"]
+    assert workspace.root.languages == ["ts"]
+    assert workspace.root.openapi_files == ["docs/swagger.json", "services/billing/api/openapi.yaml"]
+
+    merged = module.merge_detected(workspace)
+    assert merged.languages == ["go", "python", "ts"]
+    assert merged.apis == ["stripe"]
+
+    commands = module.infer_package_commands(tmp_path, workspace)
+    assert commands["services/billing"]["build"] == "make build"
+    assert commands["web"]["build"] == "pnpm run build"
+    assert commands["tools/gen"]["test"] == "pytest -q"
+
+
+def test_detect_project_ignores_nested_packages(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    write_text(tmp_path / "services" / "billing" / "go.mod", "module billing\n")
+
+    workspace = module.detect_workspace(tmp_path, find_packages=False)
+
+    assert workspace.packages == {}
+    assert module.detect_project(tmp_path).languages == []
+
+
+def test_detect_workspace_skips_installed_skills(tmp_path: Path) -> None:
+    module = load_bootstrap_module()
+    write_text(tmp_path / "go.mod", "module demo\n")
+    for target in (".codex", ".claude"):
+        skill = tmp_path / target / "skills" / "py-helper"
+        write_text(skill / "SKILL.md", "---\nname: py-helper\n---\n")
+        write_text(skill / "scripts" / "pyproject.toml", "[project]\nname = 'helper'\n")
+        write_text(skill / "references" / "openapi.yaml", "openapi: 3.0.0\n")
+
+    workspace = module.detect_workspace(tmp_path)
+
+    assert workspace.packages == {}
+    assert workspace.root.openapi_files == []
+    assert module.merge_detected(workspace).languages == ["go"]